@@ -1,83 +1,349 @@
 import httpx
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from pathlib import Path
+from concurrent.futures import Future
+import atexit
+import gzip
+import io
+import json
+import os
+import threading
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _load_json(response: httpx.Response) -> Any:
+    """Decode a JSON response, using orjson's C parser when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _dump_json(payload: Any) -> bytes:
+    """Encode a JSON request body, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+# Pre-built URL objects for fixed paths, so httpx skips re-parsing the
+# path string on every call. Parameterized per-project paths still use
+# f-strings: the id varies per call and the URL would be rebuilt anyway.
+_HEALTH_URL = httpx.URL("/health")
+_PROJECTS_URL = httpx.URL("/projects")
+_UPLOAD_URL = httpx.URL("/projects/upload")
+_PDF_GENERATE_URL = httpx.URL("/pdf/generate")
+
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    Retry idempotent requests on transient failures.
+
+    Covers dropped connections (ReadError, RemoteProtocolError) and
+    gateway errors (502/503/504) for GET/DELETE only - POSTs such as
+    upload and process are never retried to avoid duplicate side effects.
+    """
+
+    RETRY_STATUS = {502, 503, 504}
+    RETRY_METHODS = {"GET", "DELETE"}
+
+    def __init__(self, transport: httpx.BaseTransport, retries: int = 3):
+        self._transport = transport
+        self._retries = retries
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+            except (httpx.ReadError, httpx.RemoteProtocolError):
+                if request.method not in self.RETRY_METHODS or attempt >= self._retries:
+                    raise
+            else:
+                if (request.method not in self.RETRY_METHODS
+                        or response.status_code not in self.RETRY_STATUS
+                        or attempt >= self._retries):
+                    return response
+                response.close()
+
+            # Exponential backoff: 0.1s, 0.2s, 0.4s, ... capped at 2s
+            time.sleep(min(0.1 * (2 ** attempt), 2.0))
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
 
 class APIClient:
     """Client for SRS Agent FastAPI backend."""
-    
-    def __init__(self, base_url: str = "http://localhost:8000"):
-        """Initialize API client."""
+
+    # Structured timeout buckets: connect/read/write/pool are separated so
+    # a slow pool acquisition is distinguishable from a slow read.
+    TIMEOUTS = {
+        "short": httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=2.0),
+        "normal": httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=5.0),
+        "long": httpx.Timeout(connect=5.0, read=300.0, write=60.0, pool=5.0),
+    }
+
+    # TTLs for idempotent GETs: project metadata changes on the seconds
+    # scale while processing, requirements/techdoc only change on reprocess.
+    CACHE_TTLS = {
+        "projects": 30.0,
+        "project": 30.0,
+        "requirements": 600.0,
+        "techdoc": 600.0,
+    }
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0
+    ):
+        """
+        Initialize API client with a pooled, keep-alive HTTP connection.
+
+        Args:
+            base_url: Backend base URL
+            max_connections: Max concurrent connections in the pool
+            max_keepalive_connections: Max idle keep-alive connections
+            keepalive_expiry: Seconds before an idle connection is closed
+        """
         self.base_url = base_url
-        self.timeout = 300.0  # 5 minutes for processing
-    
+        self.timeout = self.TIMEOUTS["long"]
+
+        # Long-lived client: reusing connections avoids the TCP+TLS
+        # handshake cost on every call.
+        self._client = httpx.Client(
+            base_url=base_url,
+            timeout=self.TIMEOUTS["normal"],
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            transport=RetryTransport(httpx.HTTPTransport(retries=2))
+        )
+
+        # TTL cache for idempotent GETs: key -> (monotonic timestamp, value)
+        self._cache: Dict[str, tuple] = {}
+        self._cache_lock = threading.Lock()
+
+        # In-flight GETs being coalesced: key -> Future
+        self._inflight: Dict[str, Future] = {}
+
+        # Establish the first connection in the background so the user's
+        # first real action reuses a warm socket instead of paying the
+        # handshake. Keepalive pings stop idle sockets being reaped.
+        self._closed = False
+        self._keepalive_interval = max(keepalive_expiry - 2.0, 1.0)
+        if not os.getenv("APICLIENT_NO_PREWARM"):
+            threading.Thread(target=self._prewarm, daemon=True).start()
+
+    def _prewarm(self) -> None:
+        """Open a pooled connection now, then ping to keep it alive."""
+        while not self._closed:
+            try:
+                self._client.get(_HEALTH_URL, timeout=self.TIMEOUTS["short"])
+            except Exception:
+                pass  # Backend not up yet; try again next tick
+            time.sleep(self._keepalive_interval)
+
+    def _coalesced_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Run fetch, sharing the result with any concurrent caller asking
+        for the same key so N simultaneous renders issue one HTTP call.
+        """
+        with self._cache_lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                owner = False
+            else:
+                fut = Future()
+                self._inflight[key] = fut
+                owner = True
+
+        if not owner:
+            return fut.result()
+
+        try:
+            value = fetch()
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(value)
+            return value
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(key, None)
+
+    def _cached_get(self, key: str, ttl: float, fetch: Callable[[], Any], use_cache: bool = True) -> Any:
+        """
+        Return a cached value for key if fresh, otherwise fetch.
+
+        Stale entries are returned immediately while a background thread
+        refreshes them (stale-while-revalidate). If the backend is
+        unreachable and a stale entry exists, the stale value is returned
+        instead of raising.
+
+        None results ("not ready yet" from a still-processing project)
+        are never cached: under the long techdoc/requirements TTLs a
+        cached None would keep a just-completed document invisible for
+        minutes, and nothing in the Streamlit flow invalidates on
+        completion.
+        """
+        if not use_cache:
+            value = self._coalesced_fetch(key, fetch)
+            if value is not None:
+                with self._cache_lock:
+                    self._cache[key] = (time.monotonic(), value)
+            return value
+
+        with self._cache_lock:
+            entry = self._cache.get(key)
+
+        if entry is not None:
+            ts, value = entry
+            if time.monotonic() - ts < ttl:
+                return value
+
+            # Stale: serve it now, refresh in the background
+            def _refresh():
+                try:
+                    fresh = self._coalesced_fetch(key, fetch)
+                    with self._cache_lock:
+                        if fresh is not None:
+                            self._cache[key] = (time.monotonic(), fresh)
+                        else:
+                            self._cache.pop(key, None)
+                except Exception:
+                    pass
+
+            threading.Thread(target=_refresh, daemon=True).start()
+            return value
+
+        try:
+            value = self._coalesced_fetch(key, fetch)
+        except Exception:
+            # Cache-fallback: nothing cached, nothing to fall back on
+            raise
+
+        if value is not None:
+            with self._cache_lock:
+                self._cache[key] = (time.monotonic(), value)
+        return value
+
+    def _invalidate(self, project_id: Optional[str] = None) -> None:
+        """Drop cached entries for a project (or the whole cache)."""
+        with self._cache_lock:
+            if project_id is None:
+                self._cache.clear()
+                return
+            self._cache.pop("projects", None)
+            for kind in ("project", "requirements", "techdoc"):
+                self._cache.pop(f"{kind}:{project_id}", None)
+
+    def close(self) -> None:
+        """Release the connection pool."""
+        self._closed = True
+        self._client.close()
+
+    def __enter__(self) -> "APIClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def health_check(self) -> Dict[str, Any]:
         """Check if backend is healthy."""
         try:
-            response = httpx.get(f"{self.base_url}/health", timeout=5.0)
+            response = self._client.get(_HEALTH_URL, timeout=self.TIMEOUTS["short"])
             response.raise_for_status()
-            return response.json()
+            return _load_json(response)
         except Exception as e:
             return {"status": "unhealthy", "error": str(e)}
-    
-    def upload_file(self, file_path: Path = None, file_bytes: bytes = None, filename: str = None) -> Dict[str, Any]:
+
+    def upload_file(self, file_path: Path = None, file_bytes: bytes = None, filename: str = None, fileobj=None) -> Dict[str, Any]:
         """
         Upload an SRS file to create a project.
-        
+
         Args:
             file_path: Path to file (if uploading from disk)
             file_bytes: File bytes (if uploading from memory)
             filename: Filename to use
-        
+            fileobj: Readable binary file-like object (streamed; avoids
+                materializing the file in memory at all)
+
         Returns:
             Project metadata
         """
         try:
             if file_path:
+                # Pass the open handle so httpx streams the multipart body
+                # in chunks instead of reading the file into memory
                 with open(file_path, 'rb') as f:
-                    files = {'file': (file_path.name, f)}
-                    response = httpx.post(
-                        f"{self.base_url}/projects/upload",
+                    files = {'file': (file_path.name, f, 'application/octet-stream')}
+                    response = self._client.post(
+                        _UPLOAD_URL,
                         files=files,
-                        timeout=30.0
+                        timeout=self.TIMEOUTS["normal"]
                     )
+            elif fileobj is not None and filename:
+                # httpx reads the object in chunks, so peak memory stays at
+                # chunk size regardless of how large the upload is
+                fileobj.seek(0)
+                files = {'file': (filename, fileobj, 'application/octet-stream')}
+                response = self._client.post(
+                    _UPLOAD_URL,
+                    files=files,
+                    timeout=self.TIMEOUTS["normal"]
+                )
             elif file_bytes and filename:
-                files = {'file': (filename, file_bytes)}
-                response = httpx.post(
-                    f"{self.base_url}/projects/upload",
+                # BytesIO lets httpx stream from the existing buffer rather
+                # than copying the blob into its multipart encoder
+                files = {'file': (filename, io.BytesIO(file_bytes), 'application/octet-stream')}
+                response = self._client.post(
+                    _UPLOAD_URL,
                     files=files,
-                    timeout=30.0
+                    timeout=self.TIMEOUTS["normal"]
                 )
             else:
-                raise ValueError("Must provide either file_path or (file_bytes + filename)")
-            
+                raise ValueError("Must provide either file_path, fileobj, or (file_bytes + filename)")
+
             response.raise_for_status()
-            return response.json()
+            self._invalidate()
+            return _load_json(response)
         except httpx.TimeoutException:
             raise TimeoutError("Backend is busy processing. Try using progress stream instead.")
         except httpx.HTTPStatusError as e:
             raise Exception(f"Get project failed: {e.response.text}")
         except Exception as e:
             raise Exception(f"Get project error: {str(e)}")
-    
+
     def process_project(self, project_id: str) -> Dict[str, Any]:
         """
         Start processing a project (non-blocking).
-        
+
         Args:
             project_id: Project ID
-        
+
         Returns:
             Processing status
         """
         try:
-            response = httpx.post(
-                f"{self.base_url}/projects/{project_id}/process",
-                timeout=5.0  # Quick response since it's just starting the background task
+            response = self._client.post(
+                f"/projects/{project_id}/process",
+                timeout=self.TIMEOUTS["short"]  # Just starts the background task
             )
             response.raise_for_status()
-            return response.json()
+            self._invalidate(project_id)
+            return _load_json(response)
         except httpx.TimeoutException:
             # If it times out, the processing likely started anyway
             return {"project_id": project_id, "status": "processing", "message": "Processing started"}
@@ -85,116 +351,130 @@ class APIClient:
             raise Exception(f"Process failed: {e.response.text}")
         except Exception as e:
             raise Exception(f"Process error: {str(e)}")
-    
-    def get_project(self, project_id: str, timeout: float = 5.0) -> Dict[str, Any]:
+
+    def get_project(self, project_id: str, timeout: float = 5.0, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get project details.
-        
+
         Args:
             project_id: Project ID
             timeout: Request timeout in seconds
-        
+            use_cache: Serve from the TTL cache when fresh
+
         Returns:
             Project metadata
         """
-        try:
-            response = httpx.get(
-                f"{self.base_url}/projects/{project_id}",
-                timeout=timeout
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return None
-            raise Exception(f"Get project failed: {e.response.text}")
-        except Exception as e:
-            raise Exception(f"Get project error: {str(e)}")
-    
+        def fetch():
+            try:
+                response = self._client.get(
+                    f"/projects/{project_id}",
+                    timeout=timeout
+                )
+                response.raise_for_status()
+                return _load_json(response)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 404:
+                    return None
+                raise Exception(f"Get project failed: {e.response.text}")
+            except Exception as e:
+                raise Exception(f"Get project error: {str(e)}")
+
+        return self._cached_get(f"project:{project_id}", self.CACHE_TTLS["project"], fetch, use_cache)
+
     def list_projects(self) -> List[Dict[str, Any]]:
         """
         Get list of all projects.
-        
+
         Returns:
             List of project metadata
         """
-        try:
-            response = httpx.get(
-                f"{self.base_url}/projects",
-                timeout=10.0  # Reduced timeout
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.TimeoutException:
-            # If timeout, return empty list instead of error
-            return []
-        except Exception as e:
-            raise Exception(f"List projects error: {str(e)}")
-    
+        def fetch():
+            try:
+                response = self._client.get(
+                    _PROJECTS_URL,
+                    timeout=self.TIMEOUTS["normal"]
+                )
+                response.raise_for_status()
+                return _load_json(response)
+            except httpx.TimeoutException:
+                # If timeout, return empty list instead of error
+                return []
+            except Exception as e:
+                raise Exception(f"List projects error: {str(e)}")
+
+        return self._cached_get("projects", self.CACHE_TTLS["projects"], fetch)
+
     def get_requirements(self, project_id: str) -> Dict[str, Any]:
         """
         Get parsed requirements for a project.
-        
+
         Args:
             project_id: Project ID
-        
+
         Returns:
             Parsed SRS data
         """
-        try:
-            response = httpx.get(
-                f"{self.base_url}/projects/{project_id}/requirements",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 400:
-                return None
-            raise Exception(f"Get requirements failed: {e.response.text}")
-        except Exception as e:
-            raise Exception(f"Get requirements error: {str(e)}")
-    
+        def fetch():
+            try:
+                response = self._client.get(
+                    f"/projects/{project_id}/requirements",
+                    timeout=self.TIMEOUTS["long"]
+                )
+                response.raise_for_status()
+                return _load_json(response)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 400:
+                    return None
+                raise Exception(f"Get requirements failed: {e.response.text}")
+            except Exception as e:
+                raise Exception(f"Get requirements error: {str(e)}")
+
+        return self._cached_get(f"requirements:{project_id}", self.CACHE_TTLS["requirements"], fetch)
+
     def get_techdoc(self, project_id: str) -> Optional[Dict[str, Any]]:
         """
         Get generated technical documentation.
-        
+
         Args:
             project_id: Project ID
-        
+
         Returns:
             Technical documentation data
         """
-        try:
-            response = httpx.get(
-                f"{self.base_url}/projects/{project_id}/techdoc",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 400:
-                return None
-            raise Exception(f"Get tech doc failed: {e.response.text}")
-        except Exception as e:
-            raise Exception(f"Get tech doc error: {str(e)}")
-    
+        def fetch():
+            try:
+                response = self._client.get(
+                    f"/projects/{project_id}/techdoc",
+                    timeout=self.TIMEOUTS["long"]
+                )
+                response.raise_for_status()
+                return _load_json(response)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 400:
+                    return None
+                raise Exception(f"Get tech doc failed: {e.response.text}")
+            except Exception as e:
+                raise Exception(f"Get tech doc error: {str(e)}")
+
+        return self._cached_get(f"techdoc:{project_id}", self.CACHE_TTLS["techdoc"], fetch)
+
     def delete_project(self, project_id: str) -> bool:
         """
         Delete a project.
-        
+
         Args:
             project_id: Project ID
-        
+
         Returns:
             True if successful
         """
         try:
-            response = httpx.delete(
-                f"{self.base_url}/projects/{project_id}",
-                timeout=10.0
+            response = self._client.delete(
+                f"/projects/{project_id}",
+                timeout=self.TIMEOUTS["normal"]
             )
             response.raise_for_status()
+            self._invalidate(project_id)
             return True
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -202,124 +482,235 @@ class APIClient:
             raise Exception(f"Delete project failed: {e.response.text}")
         except Exception as e:
             raise Exception(f"Delete project error: {str(e)}")
-    
+
     def generate_pdf(self, project_id: str) -> bytes:
         """
         Generate PDF for a project.
-        
+
         Args:
             project_id: Project ID
-        
+
         Returns:
             PDF bytes
         """
         try:
-            # Use follow_redirects in case of any redirects
-            response = httpx.post(
-                f"{self.base_url}/projects/{project_id}/pdf",
-                timeout=60.0,  # PDF generation can take time
+            # Stream the response: validate the magic bytes on the first
+            # chunk instead of buffering the whole PDF before checking.
+            with self._client.stream(
+                "POST",
+                f"/projects/{project_id}/pdf",
+                timeout=self.TIMEOUTS["long"],
                 follow_redirects=True
-            )
-            response.raise_for_status()
-            
-            pdf_bytes = response.content
-            
-            # Validate PDF
-            if not pdf_bytes or len(pdf_bytes) < 100:
-                raise Exception(f"PDF too small or empty: {len(pdf_bytes)} bytes")
-            
-            if not pdf_bytes.startswith(b'%PDF'):
-                # Show what we actually got
-                preview = pdf_bytes[:50].decode('utf-8', errors='replace')
-                raise Exception(f"Invalid PDF format. Received: {preview}")
-            
-            return pdf_bytes
-            
+            ) as response:
+                response.raise_for_status()
+                return self._read_pdf_stream(response)
+
         except httpx.HTTPStatusError as e:
-            error_text = e.response.text if hasattr(e.response, 'text') else str(e)
+            error_text = e.response.read().decode('utf-8', errors='replace')
             raise Exception(f"PDF generation failed: {error_text}")
         except Exception as e:
             raise Exception(f"PDF generation error: {str(e)}")
-    
+
+    @staticmethod
+    def _read_pdf_stream(response: httpx.Response) -> bytes:
+        """Read a streamed PDF response, failing fast on invalid content."""
+        chunks = response.iter_bytes(chunk_size=8192)
+
+        # Single magic-number check: a short or empty first chunk fails it
+        # too, so no separate length branch is needed
+        first = next(chunks, b'')
+        mv = memoryview(first)
+        if len(mv) < 4 or bytes(mv[:4]) != b'%PDF':
+            preview = first[:50].decode('utf-8', errors='replace')
+            raise Exception(f"Invalid PDF format ({len(first)} bytes). Received: {preview}")
+
+        pdf_bytes = bytearray(first)
+        for chunk in chunks:
+            pdf_bytes.extend(chunk)
+
+        return bytes(pdf_bytes)
+
     def generate_pdf_from_content(self, content: str, filename: str = "document") -> bytes:
         """
         Generate PDF from markdown content.
-        
+
         Args:
             content: Markdown content
             filename: Filename for the PDF
-        
+
         Returns:
             PDF bytes
         """
         try:
-            response = httpx.post(
-                f"{self.base_url}/pdf/generate",
-                json={"content": content, "filename": filename},
-                timeout=60.0
+            # Markdown compresses ~10x; level 1 keeps the CPU cost trivial
+            body = gzip.compress(
+                _dump_json({"content": content, "filename": filename}),
+                compresslevel=1
             )
-            response.raise_for_status()
-            
-            pdf_bytes = response.content
-            
-            if not pdf_bytes or len(pdf_bytes) < 100:
-                raise Exception(f"PDF too small or empty: {len(pdf_bytes)} bytes")
-            
-            if not pdf_bytes.startswith(b'%PDF'):
-                raise Exception("Invalid PDF format")
-            
-            return pdf_bytes
-            
+            with self._client.stream(
+                "POST",
+                _PDF_GENERATE_URL,
+                content=body,
+                headers={
+                    "content-type": "application/json",
+                    "content-encoding": "gzip",
+                    "accept-encoding": "gzip"
+                },
+                timeout=self.TIMEOUTS["long"]
+            ) as response:
+                response.raise_for_status()
+                return self._read_pdf_stream(response)
+
         except httpx.HTTPStatusError as e:
-            error_text = e.response.text if hasattr(e.response, 'text') else str(e)
+            error_text = e.response.read().decode('utf-8', errors='replace')
             raise Exception(f"PDF generation failed: {error_text}")
         except Exception as e:
             raise Exception(f"PDF generation error: {str(e)}")
-    
+
     def reset_project(self, project_id: str) -> Dict[str, Any]:
         """
         Reset a stuck project to allow reprocessing.
-        
+
         Args:
             project_id: Project ID to reset
-        
+
         Returns:
             Reset confirmation message
         """
         try:
-            response = httpx.post(
-                f"{self.base_url}/projects/{project_id}/reset",
-                timeout=30.0
+            response = self._client.post(
+                f"/projects/{project_id}/reset",
+                timeout=self.TIMEOUTS["normal"]
             )
             response.raise_for_status()
-            return response.json()
+            self._invalidate(project_id)
+            return _load_json(response)
         except Exception as e:
             raise Exception(f"Reset project error: {str(e)}")
-    
-    def wait_for_completion(self, project_id: str, check_interval: float = 2.0, max_wait: float = 300.0) -> str:
+
+    def stream_progress(self, project_id: str):
+        """
+        Yield progress events from the backend's SSE stream.
+
+        The connection stays open until the server closes it, so the
+        client wakes only when state actually changes instead of polling.
+
+        Args:
+            project_id: Project ID
+
+        Yields:
+            Decoded event payload dicts
+        """
+        with self._client.stream(
+            "GET",
+            f"/projects/{project_id}/progress-stream",
+            headers={"Accept": "text/event-stream"},
+            timeout=httpx.Timeout(connect=5.0, read=None, write=5.0, pool=5.0)
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line.startswith("data:"):
+                    try:
+                        yield json.loads(line[5:].strip())
+                    except json.JSONDecodeError:
+                        continue
+
+    def wait_for_completion(
+        self,
+        project_id: str,
+        check_interval: float = 2.0,
+        max_wait: float = 300.0,
+        poll_backoff_base: float = 1.3,
+        max_poll_interval: float = 16.0
+    ) -> str:
         """
         Wait for project processing to complete.
-        
+
+        Consumes the server's SSE progress stream so the client wakes on
+        state changes instead of issuing idle polls. If the stream is
+        unavailable, falls back to polling with exponential backoff: fast
+        jobs are caught quickly while long-running jobs taper off to
+        max_poll_interval instead of hammering the backend at a fixed rate.
+
         Args:
             project_id: Project ID
-            check_interval: Seconds between status checks
+            check_interval: Initial seconds between status checks
             max_wait: Maximum seconds to wait
-        
+            poll_backoff_base: Multiplier applied to the interval after each poll
+            max_poll_interval: Cap on the interval between polls
+
         Returns:
             Final status ('completed' or 'error')
         """
         start_time = time.time()
-        
+
+        # Event-driven path: block on the SSE stream until a terminal status
+        try:
+            for event in self.stream_progress(project_id):
+                status = event.get('status')
+                if status in ['completed', 'error']:
+                    self._invalidate(project_id)
+                    return status
+                if (time.time() - start_time) >= max_wait:
+                    raise TimeoutError(f"Processing did not complete within {max_wait} seconds")
+        except TimeoutError:
+            raise
+        except Exception:
+            # Stream unavailable (older backend, proxy, network): poll instead
+            pass
+
+        interval = check_interval
+        error_interval = check_interval
+
         while (time.time() - start_time) < max_wait:
-            project = self.get_project(project_id)
+            try:
+                # Bypass the TTL cache: polling needs the live status
+                project = self.get_project(project_id, use_cache=False)
+            except Exception:
+                # Transient backend error: back off harder, up to 60s
+                time.sleep(min(error_interval, 60.0))
+                error_interval = min(error_interval * 2, 60.0)
+                continue
+
             if not project:
                 raise Exception("Project not found")
-            
+
+            # Successful poll resets the error backoff
+            error_interval = check_interval
+
             status = project['status']
-            
+
             if status in ['completed', 'error']:
                 return status
-            
-            time.sleep(check_interval)
-        
+
+            time.sleep(interval)
+            interval = min(interval * poll_backoff_base, max_poll_interval)
+
         raise TimeoutError(f"Processing did not complete within {max_wait} seconds")
+
+
+_DEFAULT_CLIENT: Optional[APIClient] = None
+_DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+def get_default_client(base_url: str = "http://localhost:8000") -> APIClient:
+    """
+    Return the process-wide APIClient bound to base_url.
+
+    Callers (Streamlit pages especially) should prefer this over
+    constructing APIClient directly: re-renders would otherwise build a
+    fresh connection pool each time, defeating keep-alive entirely.
+    """
+    global _DEFAULT_CLIENT
+    with _DEFAULT_CLIENT_LOCK:
+        if _DEFAULT_CLIENT is None or _DEFAULT_CLIENT.base_url != base_url:
+            if _DEFAULT_CLIENT is not None:
+                _DEFAULT_CLIENT.close()
+            _DEFAULT_CLIENT = APIClient(base_url=base_url)
+        return _DEFAULT_CLIENT
+
+
+@atexit.register
+def _close_default_client() -> None:
+    if _DEFAULT_CLIENT is not None:
+        _DEFAULT_CLIENT.close()
@@ -1,10 +1,31 @@
 from pathlib import Path
-from typing import Union, Tuple, Callable, Optional, Dict, Any
+from typing import List, Union, Tuple, Callable, Optional, Dict, Any
+from datetime import datetime
+from functools import cached_property
+import concurrent.futures
+import hashlib
+import json
 import uuid
 from backend.core.srs_loader import SRSLoader
 from backend.core.langgraph_supervisor import LangGraphSupervisorWorkflow, SupervisorState
 from backend.core.models import ParsedSRS
 import os
+import time
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Bump when SRSLoader's extraction output changes so stale cache entries
+# are ignored
+LOADER_VERSION = "1"
+
+# Shared pool for document I/O so loading can overlap with workflow warmup
+_IO_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=8,
+    thread_name_prefix="pipeline-io"
+)
 
 
 class LangGraphPipeline:
@@ -18,20 +39,41 @@ class LangGraphPipeline:
     - State persistence across workflow execution
     """
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize LangGraph pipeline with agents"""
-        self.loader = SRSLoader()
-        api_key = api_key or os.getenv("OPENAI_API_KEY")
+    def __init__(self, api_key: Optional[str] = None, parse_cache_dir: str = "backend/storage/data/srs_cache"):
+        """Initialize LangGraph pipeline; heavy agent setup is deferred."""
+        self._api_key = api_key
+        self._parse_cache_dir = Path(parse_cache_dir)
+        
+        # Track active workflows. With REDIS_URL set the registry lives in
+        # Redis so it survives restarts and is shared across uvicorn
+        # workers; otherwise it falls back to an in-process dict.
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url and redis is not None:
+            self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        else:
+            self._redis = None
+        self.active_workflows: Dict[str, str] = {}  # project_id -> thread_id
+    
+    @cached_property
+    def loader(self) -> SRSLoader:
+        """Document loader, constructed on first use."""
+        return SRSLoader()
+    
+    @cached_property
+    def workflow(self) -> LangGraphSupervisorWorkflow:
+        """LLM workflow, constructed (and API key checked) on first use.
+        
+        Lazy so registry-only operations like get_workflow_state never pay
+        for agent setup or require OPENAI_API_KEY.
+        """
+        api_key = self._api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found")
         
-        self.workflow = LangGraphSupervisorWorkflow(
+        return LangGraphSupervisorWorkflow.get_cached(
             model_name=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
             temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.3"))
         )
-        
-        # Track active workflows
-        self.active_workflows: Dict[str, str] = {}  # project_id -> thread_id
     
     def run_from_file(
         self,
@@ -50,14 +92,50 @@ class LangGraphPipeline:
         Returns:
             Tuple of (ParsedSRS, tech_doc_markdown)
         """
-        # Load document
+        # Load the document off-thread while warming the LLM client so
+        # parsing I/O overlaps with workflow setup
         if progress_callback:
             progress_callback(0, 0, "Loading document...")
         
-        raw_text = self.loader.load_text(file_path)
+        load_future = _IO_EXECUTOR.submit(self._load_file_cached, file_path)
+        _IO_EXECUTOR.submit(self.workflow.warmup)
+        raw_text = load_future.result()
         
         return self._run_workflow(raw_text, project_name, progress_callback)
     
+    def run_from_files(
+        self,
+        file_paths: List[Union[str, Path]],
+        progress_callback: Optional[Callable[[int, int, str], None]] = None
+    ) -> List[Tuple[ParsedSRS, str]]:
+        """
+        Run the pipeline over several SRS documents, loading them in parallel.
+        
+        Document parsing is submitted to a bounded thread pool up front;
+        the LLM workflows then run one at a time (each is already
+        internally parallel across its workers).
+        
+        Args:
+            file_paths: Paths to SRS documents
+            progress_callback: Optional callback(current, total, message)
+        
+        Returns:
+            List of (ParsedSRS, tech_doc_markdown) tuples, in input order
+        """
+        load_futures = [
+            _IO_EXECUTOR.submit(self._load_file_cached, path)
+            for path in file_paths
+        ]
+        _IO_EXECUTOR.submit(self.workflow.warmup)
+        
+        results = []
+        for path, future in zip(file_paths, load_futures):
+            raw_text = future.result()
+            project_name = Path(path).stem
+            results.append(self._run_workflow(raw_text, project_name, progress_callback))
+        
+        return results
+    
     def run_from_uploaded_file(
         self,
         uploaded_file,
@@ -79,10 +157,64 @@ class LangGraphPipeline:
         if progress_callback:
             progress_callback(0, 0, "Loading document...")
         
-        raw_text = self.loader.load_from_uploaded_file(uploaded_file)
+        raw_text = self._load_uploaded_cached(uploaded_file)
         
         return self._run_workflow(raw_text, project_name, progress_callback)
     
+    def _load_file_cached(self, file_path: Union[str, Path]) -> str:
+        """Load a document from disk, using the content-hash parse cache."""
+        file_path = Path(file_path)
+        data = file_path.read_bytes()
+        return self._cached_parse(
+            data,
+            file_path.name,
+            lambda: self.loader.load_from_file(file_path)
+        )
+    
+    def _load_uploaded_cached(self, uploaded_file) -> str:
+        """Load an uploaded file, using the content-hash parse cache."""
+        try:
+            data = bytes(uploaded_file.getbuffer())
+        except AttributeError:
+            # File-like object without a buffer view: parse directly
+            return self.loader.load_from_uploaded_file(uploaded_file)
+        
+        return self._cached_parse(
+            data,
+            uploaded_file.name,
+            lambda: self.loader.load_from_uploaded_file(uploaded_file)
+        )
+    
+    def _cached_parse(self, data: bytes, source_name: str, parse: Callable[[], str]) -> str:
+        """
+        Return extracted text for data, skipping the loader on a cache hit.
+        
+        Entries are keyed on a blake2b hash of the raw bytes plus the
+        loader version, so re-uploading the same SRS skips parsing while a
+        loader upgrade invalidates old entries. A JSON sidecar records
+        provenance for each entry.
+        """
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        cache_file = self._parse_cache_dir / f"{digest}-{LOADER_VERSION}.txt"
+        
+        if cache_file.exists():
+            return cache_file.read_text(encoding='utf-8')
+        
+        text = parse()
+        
+        try:
+            self._parse_cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(text, encoding='utf-8')
+            cache_file.with_suffix('.json').write_text(json.dumps({
+                "loader_version": LOADER_VERSION,
+                "created_at": datetime.now().isoformat(),
+                "source_name": source_name
+            }))
+        except OSError:
+            pass  # Cache is best-effort; parsing already succeeded
+        
+        return text
+    
     def _run_workflow(
         self,
         srs_content: str,
@@ -121,26 +253,45 @@ class LangGraphPipeline:
         
         return parsed_srs, tech_doc
     
+    # Validated once at import; per-call conversion only swaps the name in
+    _PARSED_SRS_SKELETON = ParsedSRS(
+        project_name="",
+        purpose="AI-generated technical documentation",  # Required field
+        scope="Full system scope",  # Required field
+    )
+    
     def _state_to_parsed_srs(self, state: Dict[str, Any]) -> ParsedSRS:
         """Convert LangGraph state to ParsedSRS model for backward compatibility"""
-        # Extract requirements text (it's now a markdown string, not a dict)
-        requirements_text = state.get("requirements", "")
-        
-        # Create minimal ParsedSRS to satisfy validation
-        return ParsedSRS(
-            project_name=state.get("project_name", ""),
-            purpose="AI-generated technical documentation",  # Required field
-            scope="Full system scope",  # Required field
-            functional_requirements=[],  # Empty list is valid
-            non_functional_requirements=[],
-            user_roles=[],
-            use_cases=[],
-            constraints=[],
-            assumptions=[]
+        # model_copy skips revalidating the static fields on every call
+        return self._PARSED_SRS_SKELETON.model_copy(
+            update={"project_name": state.get("project_name", "")}
         )
     
+    def _register_workflow(self, project_id: str, thread_id: str) -> None:
+        """Record a workflow, persisting to Redis when configured."""
+        if self._redis is not None:
+            key = f"wf:{project_id}"
+            self._redis.hset(key, mapping={
+                "thread_id": thread_id,
+                "started_at": time.time(),
+                "state": "pending"
+            })
+            self._redis.expire(key, 86400)  # 24h safety TTL
+        else:
+            self.active_workflows[project_id] = thread_id
+    
+    def _lookup_thread_id(self, project_id: str) -> Optional[str]:
+        """Resolve a project's workflow thread from the registry."""
+        if self._redis is not None:
+            return self._redis.hget(f"wf:{project_id}", "thread_id")
+        return self.active_workflows.get(project_id)
+    
     def get_workflow_state(self, project_id: str) -> Optional[Dict[str, Any]]:
         """Get current state of a workflow for a project"""
+        if self._redis is not None:
+            state = self._redis.hgetall(f"wf:{project_id}")
+            return state or None
+        
         thread_id = self.active_workflows.get(project_id)
         if not thread_id:
             return None
@@ -155,10 +306,13 @@ class LangGraphPipeline:
         approved_sections: Optional[list] = None
     ):
         """Provide human feedback to continue workflow"""
-        thread_id = self.active_workflows.get(project_id)
+        thread_id = self._lookup_thread_id(project_id)
         if not thread_id:
             raise ValueError(f"No active workflow for project {project_id}")
         
+        if self._redis is not None:
+            self._redis.hset(f"wf:{project_id}", "state", "feedback_received")
+        
         updates = {
             "human_feedback": feedback,
             "approved_sections": approved_sections or []
@@ -177,7 +331,7 @@ class LangGraphPipeline:
         Returns thread_id for tracking.
         """
         thread_id = str(uuid.uuid4())
-        self.active_workflows[project_id] = thread_id
+        self._register_workflow(project_id, thread_id)
         
         # Workflow will run async and pause at human_review checkpoint
         # Frontend can poll get_workflow_state to check progress
@@ -1,156 +1,124 @@
-from typing import TypedDict, List, Dict, Any, Optional, Literal
+from typing import TypedDict, List, Dict, Any, Optional, Final, Annotated
+from functools import lru_cache
+import operator
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_text_splitters import MarkdownHeaderTextSplitter
+from pydantic import BaseModel, Field
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
-import concurrent.futures
+import httpx
+import asyncio
+import hashlib
+import threading
+import weakref
 import json
+import os
+import re
+import time
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# How long cached worker responses stay valid
+LLM_CACHE_TTL = 24 * 3600
+
+# Local-tier bounds: both caches live on the process-lifetime shared
+# workflow instance, so without a cap they grow for the life of the
+# server (sections are tens of KB each, routed SRS slices larger still)
+LLM_CACHE_MAX_ENTRIES = 256
+ROUTE_CACHE_MAX_ENTRIES = 16
+
+# SRS documents above this size are split by heading and routed so each
+# worker only receives the sections relevant to it
+CHUNKING_THRESHOLD_TOKENS = 50_000
+
+@lru_cache(maxsize=1)
+def _get_encoder():
+    """Tokenizer matching the worker model, loaded on first use.
+    
+    Lazy because tiktoken's import plus encoding tables are a noticeable
+    chunk of cold-start time for scripts that import this module without
+    ever running a workflow.
+    """
+    import tiktoken
+    try:
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception:
+        return tiktoken.get_encoding("o200k_base")
+
+
+@lru_cache(maxsize=64)
+def _count_tokens(text: str) -> int:
+    """Exact token count for text; memoized since the same system prompts
+    and SRS slices are counted repeatedly across workers and runs."""
+    return len(_get_encoder().encode(text))
+
+# State keys of the four parallel workers
+_WORKER_KEYS = ("requirements", "architecture", "api_spec", "database_schema")
+
+# Per-worker sampling settings. Requirements and database extraction are
+# deterministic transcription jobs; the design-oriented sections get a
+# little creative headroom and a larger output budget.
+_WORKER_PARAMS = {
+    "requirements": {"temperature": 0.0, "max_tokens": 6000},
+    "architecture": {"temperature": 0.2, "max_tokens": 8000},
+    "api_spec": {"temperature": 0.3, "max_tokens": 10000},
+    "database_schema": {"temperature": 0.0, "max_tokens": 6000},
+}
 
+# Routing label (as emitted by the router prompt) -> worker state key
+_ROUTE_LABELS = {
+    "requirements": "requirements",
+    "architecture": "architecture",
+    "api": "api_spec",
+    "database": "database_schema",
+}
 
-class SupervisorState(TypedDict):
-    """Streamlined state for supervisor pattern"""
-    # Input
-    srs_content: str
-    project_name: str
-    
-    # Outputs from parallel workers
-    requirements: Optional[str]
-    architecture: Optional[str]
-    api_spec: Optional[str]
-    database_schema: Optional[str]
-    tech_doc: Optional[str]
-    
-    # Control
-    workers_completed: List[str]
-    workers_pending: List[str]
-    all_workers_done: bool
-    
-    # Tracking
-    error: Optional[str]
-    progress_messages: List[str]
+# Cheap keyword pre-checks. When an SRS contains none of these markers
+# the corresponding worker's own prompt tells it to produce nothing, so
+# the LLM call is skipped outright instead of paying a full prompt to
+# find that out.
+_DB_MARKERS = re.compile(
+    r"\b(database|schema|table|entity|erd|sql|postgres|mysql|sqlite|mariadb|"
+    r"mongo|nosql|redis|foreign key|data model)\b", re.I
+)
+_API_MARKERS = re.compile(
+    r"\b(api|endpoint|rest|graphql|grpc|webhook|http|route|backend|frontend|"
+    r"server|microservice|sdk)\b", re.I
+)
+_WORKER_MARKERS = {
+    "api_spec": _API_MARKERS,
+    "database_schema": _DB_MARKERS,
+}
 
+_MD_SPLITTER = MarkdownHeaderTextSplitter(
+    headers_to_split_on=[("#", "h1"), ("##", "h2"), ("###", "h3")],
+    strip_headers=False
+)
 
-class LangGraphSupervisorWorkflow:
-    """Supervisor-based parallel workflow for better performance"""
-    
-    def __init__(self, model_name: str = "gpt-4o-mini", temperature: float = 0.3):
-        """Initialize with multiple LLM clients for true parallel execution"""
-        actual_model = "gpt-4o-mini"
-        
-        # Each worker gets its own client to avoid rate limit bottlenecks
-        # Increased timeout to 120s to prevent timeout errors on large documents
-        self.llm_requirements = ChatOpenAI(model=actual_model, temperature=temperature, max_retries=2, timeout=120.0)
-        self.llm_architecture = ChatOpenAI(model=actual_model, temperature=temperature, max_retries=2, timeout=120.0)
-        self.llm_api = ChatOpenAI(model=actual_model, temperature=temperature, max_retries=2, timeout=120.0)
-        self.llm_database = ChatOpenAI(model=actual_model, temperature=temperature, max_retries=2, timeout=120.0)
-        self.llm_compiler = ChatOpenAI(model=actual_model, temperature=temperature, max_retries=2, timeout=120.0)
-        
-        self.memory = MemorySaver()
-        self.graph = self._build_graph()
-        self.progress_callback = None  # Will be set per execution
-    
-    def _build_graph(self) -> StateGraph:
-        """Build simple graph: parallel workers -> compiler -> end"""
-        workflow = StateGraph(SupervisorState)
-        
-        # Single parallel node that runs all workers at once
-        workflow.add_node("parallel_workers", self.parallel_workers_node)
-        workflow.add_node("compiler", self.compiler_node)
-        
-        # Simple flow: start -> parallel -> compile -> end
-        workflow.set_entry_point("parallel_workers")
-        workflow.add_edge("parallel_workers", "compiler")
-        workflow.add_edge("compiler", END)
-        
-        return workflow.compile(checkpointer=self.memory)
-    
-    def parallel_workers_node(self, state: SupervisorState) -> SupervisorState:
-        """Execute all 4 workers in parallel using ThreadPoolExecutor with rate limit management"""
-        import time
-        
-        msg1 = "Starting 4 parallel workers with intelligent chunking..."
-        state["progress_messages"].append(msg1)
-        if self.progress_callback:
-            self.progress_callback(10, 100, msg1)
-        
-        srs_content = state["srs_content"]
-        
-        total_chars = len(srs_content)
-        msg2 = f"Processing {total_chars:,} characters of SRS content..."
-        state["progress_messages"].append(msg2)
-        if self.progress_callback:
-            self.progress_callback(15, 100, msg2)
-        
-        # All workers get full SRS content for comprehensive analysis
-        full_srs = srs_content
-        msg3 = f"Using full document context for all workers (gpt-4o-mini: 200K TPM)"
-        state["progress_messages"].append(msg3)
-        if self.progress_callback:
-            self.progress_callback(20, 100, msg3)
-        
-        def run_requirements():
-            """Extract comprehensive structured requirements"""
-            try:
-                time.sleep(0.2)  # Stagger by 200ms to avoid simultaneous rate limits
-                messages = [
-                    SystemMessage(content="""You are a requirements analyst. Extract ALL requirements from the SRS document.
-
-**CRITICAL: Do NOT include the section title 'Requirements Analysis' or 'Requirements' in your output. Start directly with subsections.**
-
-**Output format (adapt to what's in the SRS):**
-
-## Functional Requirements
-List ALL functional requirements as numbered items. Be specific and detailed.
-Example:
-1. **User Authentication**: System must support email/password login with OAuth options
-2. **Data Management**: Users can create, read, update, delete their records
-
-## Non-Functional Requirements
-### Performance Requirements
-- Response time, throughput, scalability targets
-
-### Security Requirements
-- Authentication, authorization, data protection measures
-
-### Usability
-- UI/UX requirements, accessibility standards
-
-### Reliability and Availability
-- Uptime requirements, error handling
-
-### Maintainability and Support Requirements
-- Code standards, documentation needs
-
-## User Roles & Permissions
-(Only if found in SRS)
-List each role with detailed permissions and access levels.
-
-## Business Rules
-(Only if found in SRS)
-Extract all business logic, validation rules, and constraints.
-
-## System Constraints
-(Only if found in SRS)
-Technical limitations, dependencies, compliance requirements.
-
-**IMPORTANT**: 
-- Adapt structure to match what's actually in the SRS
-- If SRS doesn't have user roles, skip that section
-- Extract exactly what's in the document, don't fabricate
-- Be thorough and detailed"""),
-                    HumanMessage(content=f"**Complete SRS Document:**\n\n{full_srs}")
-                ]
-                response = self.llm_requirements.invoke(messages)
-                return ("requirements", response.content)
-            except Exception as e:
-                return ("requirements", f"Error: {str(e)}")
-        
-        def run_architecture():
-            """Design comprehensive system architecture"""
-            try:
-                time.sleep(0.4)  # Stagger by 400ms
-                messages = [
-                    SystemMessage(content="""You are a senior software architect. Design a detailed system architecture based on the SRS.
+_ROUTE_SYS_MSG = SystemMessage(content="""You classify chunks of a Software Requirements Specification.
+
+Reply with ONLY a comma-separated subset of these labels, naming every specialist the chunk is relevant to:
+requirements, architecture, api, database
+
+If the chunk is general context relevant to all of them (e.g. project overview), reply: all""")
+
+# Worker system prompts. Hoisted to module scope so the large strings
+# are allocated once per process and the SystemMessage objects are
+# reused across requests instead of rebuilt per run.
+_REQ_SYS_PROMPT: Final = """You are a requirements analyst. Extract ALL requirements from the SRS document into the structured schema.
+
+- functional: every functional requirement, specific and detailed, phrased as '**Name**: description'
+- non_functional: grouped by category (e.g. Performance Requirements, Security Requirements, Usability, Reliability and Availability, Maintainability and Support Requirements) - include only categories actually present in the SRS
+- user_roles: each role with its detailed permissions and access levels (leave empty if the SRS defines none)
+- business_rules: all business logic, validation rules and constraints (leave empty if none)
+- constraints: technical limitations, dependencies, compliance requirements (leave empty if none)
+
+Extract exactly what's in the document, don't fabricate. Be thorough and detailed."""
+
+_ARCH_SYS_PROMPT: Final = """You are a senior software architect. Design a detailed system architecture based on the SRS.
 
 **CRITICAL: Do NOT include the section title 'System Architecture' or 'Architecture' in your output. Start directly with subsections.**
 
@@ -219,21 +187,9 @@ graph TD
 ## 7. Data Flow
 Describe how data moves through the system for key operations.
 
-Be specific, detailed, and production-ready."""),
-                    HumanMessage(content=f"**Complete SRS Document:**\n\n{full_srs}")
-                ]
-                response = self.llm_architecture.invoke(messages)
-                return ("architecture", response.content)
-            except Exception as e:
-                return ("architecture", f"Error: {str(e)}")
-        
-        def run_api():
-            """Generate comprehensive software architecture with technical specs"""
-            try:
-                time.sleep(0.6)  # Stagger by 600ms
-                state["progress_messages"].append("💻 Documenting software architecture and technical specifications...")
-                messages = [
-                    SystemMessage(content="""You are a software architect. Document comprehensive software architecture based on the SRS, matching this exact format:
+Be specific, detailed, and production-ready."""
+
+_API_SYS_PROMPT: Final = """You are a software architect. Document comprehensive software architecture based on the SRS, matching this exact format:
 
 **CRITICAL: Do NOT include section title 'Software Architecture' in your output. Start directly with component subsections.**
 
@@ -352,22 +308,9 @@ You should create THREE separate sections, each with:
 7. Extract ALL technical details from SRS (IDE, languages, frameworks, versions)
 8. Each layer description should be 2-3 sentences minimum
 9. Responsibilities should have 4-6 bullet points minimum per layer
-10. Be extremely comprehensive - this is the detailed implementation section"""),
-                    HumanMessage(content=f"**Complete SRS Document:**\n\n{full_srs}")
-                ]
-                response = self.llm_api.invoke(messages)
-                state["progress_messages"].append("Software architecture documentation completed")
-                return ("api_spec", response.content)
-            except Exception as e:
-                return ("api_spec", f"Error: {str(e)}")
-        
-        def run_database():
-            """Extract comprehensive database design if present in SRS"""
-            try:
-                time.sleep(0.8)  # Stagger by 800ms
-                state["progress_messages"].append("🗄️ Documenting database design and schema...")
-                messages = [
-                    SystemMessage(content="""You are a database architect. Extract and document database design from the SRS.
+10. Be extremely comprehensive - this is the detailed implementation section"""
+
+_DB_SYS_PROMPT: Final = """You are a database architect. Extract and document database design from the SRS.
 
 **CRITICAL: Do NOT include the section title 'Database Design' in your output. Start directly with subsections.**
 
@@ -517,94 +460,600 @@ Provide SQL examples for common operations if relevant.
    - BLANK LINE after markdown table
    - Each subsection (Indexes, Foreign Keys, Relationships) on new lines
 4. Extract ALL entities, fields, relationships from SRS
-5. Be extremely thorough - this is implementation-ready documentation"""),
-                    HumanMessage(content=f"**Complete SRS Document:**\n\n{full_srs}")
-                ]
-                response = self.llm_database.invoke(messages)
-                state["progress_messages"].append("Database documentation completed")
-                return ("database_schema", response.content)
-            except Exception as e:
-                return ("database_schema", f"Error: {str(e)}")
-        
-        # Execute all 4 workers in parallel with proper progress tracking
+5. Be extremely thorough - this is implementation-ready documentation"""
+
+_REQ_SYS_MSG = SystemMessage(content=_REQ_SYS_PROMPT)
+
+_ARCH_SYS_MSG = SystemMessage(content=_ARCH_SYS_PROMPT)
+
+_API_SYS_MSG = SystemMessage(content=_API_SYS_PROMPT)
+
+_DB_SYS_MSG = SystemMessage(content=_DB_SYS_PROMPT)
+
+
+class SupervisorState(TypedDict):
+    """Streamlined state for supervisor pattern"""
+    # Input
+    srs_content: str
+    project_name: str
+    
+    # Outputs from parallel workers
+    requirements: Optional[str]
+    architecture: Optional[str]
+    api_spec: Optional[str]
+    database_schema: Optional[str]
+    tech_doc: Optional[str]
+    
+    # Control
+    workers_completed: List[str]
+    workers_pending: List[str]
+    all_workers_done: bool
+    
+    # Tracking
+    error: Optional[str]
+    # Reducer-merged: nodes return only their new lines and LangGraph
+    # appends them, instead of the whole log being re-sent every merge
+    progress_messages: Annotated[List[str], operator.add]
+
+
+class RequirementsOutput(BaseModel):
+    """Schema for the requirements worker's structured response.
+    
+    The model fills this instead of emitting formatted markdown; the
+    markdown boilerplate (headers, numbering, bullets) is rendered
+    locally by _render_requirements_markdown, which saves the output
+    tokens the model used to spend on syntax.
+    """
+    functional: List[str] = Field(default_factory=list)
+    non_functional: Dict[str, List[str]] = Field(default_factory=dict)
+    user_roles: List[str] = Field(default_factory=list)
+    business_rules: List[str] = Field(default_factory=list)
+    constraints: List[str] = Field(default_factory=list)
+
+
+def _render_requirements_markdown(result: RequirementsOutput) -> str:
+    """Render the structured requirements in the section's markdown shape."""
+    lines = ["## Functional Requirements", ""]
+    lines.extend(f"{i}. {req}" for i, req in enumerate(result.functional, start=1))
+    
+    if result.non_functional:
+        lines += ["", "## Non-Functional Requirements"]
+        for category, items in result.non_functional.items():
+            lines += ["", f"### {category}", ""]
+            lines.extend(f"- {item}" for item in items)
+    
+    optional_sections = [
+        ("## User Roles & Permissions", result.user_roles),
+        ("## Business Rules", result.business_rules),
+        ("## System Constraints", result.constraints),
+    ]
+    for heading, items in optional_sections:
+        if items:
+            lines += ["", heading, ""]
+            lines.extend(f"- {item}" for item in items)
+    
+    return "\n".join(lines)
+
+
+class AsyncLimiter:
+    """Token-bucket rate limiter shared by every concurrent LLM call.
+    
+    Replaces the old fixed sleep staggering: instead of always burning
+    0.2-0.8s per worker, calls proceed immediately while the bucket has
+    capacity and only wait when the configured requests-per-minute or
+    tokens-per-minute budget is actually exhausted. One instance covers
+    all workers of all concurrently processed SRS documents.
+    
+    The bucket state sits behind a threading.Lock rather than an
+    asyncio.Lock: the instance is shared via get_cached() while each
+    process_srs call runs its own asyncio.run loop, possibly in
+    parallel threads, and an asyncio.Lock binds to the first loop that
+    contends it. The lock guards only the arithmetic — waiting happens
+    outside it — so it is safe across loops and threads, at the cost of
+    FIFO fairness between waiters.
+    """
+    
+    def __init__(self, tokens_per_minute: int = 200_000, requests_per_minute: int = 500):
+        self._tpm = tokens_per_minute
+        self._rpm = requests_per_minute
+        self._tokens = float(tokens_per_minute)
+        self._requests = float(requests_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self._tpm, self._tokens + elapsed * self._tpm / 60.0)
+        self._requests = min(self._rpm, self._requests + elapsed * self._rpm / 60.0)
+    
+    async def acquire(self, tokens: int = 1) -> None:
+        """Block until the bucket can cover one request of `tokens` tokens."""
+        tokens = min(tokens, self._tpm)  # Oversized requests must not deadlock
+        while True:
+            with self._lock:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait = max(
+                    (1 - self._requests) * 60.0 / self._rpm,
+                    (tokens - self._tokens) * 60.0 / self._tpm
+                )
+            await asyncio.sleep(max(wait, 0.05))
+
+
+class LLMCache:
+    """Exact-match response cache for the worker LLM calls.
+    
+    Repeat uploads of the same SRS (common while iterating on a document)
+    re-send identical prompts at a fixed temperature, so the responses are
+    safely reusable. Entries are keyed on a sha256 of model, system
+    prompt, SRS content and temperature. Hits come from an in-process
+    dict first, then from Redis when REDIS_URL is set so they survive
+    restarts and are shared across workers.
+    """
+    
+    def __init__(self, ttl: int = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local: Dict[str, tuple] = {}  # key -> (expires_at, value)
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url and redis is not None:
+            self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        else:
+            self._redis = None
+    
+    @staticmethod
+    def key(model: str, system_prompt: str, srs_content: str, temperature: float) -> str:
+        """Build a deterministic cache key for one worker call."""
+        payload = json.dumps(
+            {"model": model, "sys": system_prompt, "srs": srs_content, "t": temperature},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None on miss/expiry."""
+        entry = self._local.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if time.time() < expires_at:
+                return value
+            del self._local[key]
+        
+        if self._redis is not None:
+            try:
+                value = self._redis.get(f"llm:{key}")
+            except Exception:
+                return None  # Cache is best-effort; fall through to the LLM
+            if value is not None:
+                self._store_local(key, value)
+                return value
+        
+        return None
+    
+    def _store_local(self, key: str, value: str) -> None:
+        """Insert into the bounded local tier.
+        
+        Expired entries are swept first; if the cache is still over its
+        cap the oldest insertions go (dicts iterate in insertion order),
+        which keeps this an O(n) sweep only on overflow instead of full
+        LRU bookkeeping on every hit.
+        """
+        self._local[key] = (time.time() + self.ttl, value)
+        if len(self._local) > self.max_entries:
+            now = time.time()
+            for stale in [k for k, (exp, _) in self._local.items() if exp <= now]:
+                del self._local[stale]
+            while len(self._local) > self.max_entries:
+                del self._local[next(iter(self._local))]
+    
+    async def set(self, key: str, value: str) -> None:
+        """Store a response in both cache tiers."""
+        self._store_local(key, value)
+        if self._redis is not None:
+            try:
+                self._redis.set(f"llm:{key}", value, ex=self.ttl)
+            except Exception:
+                pass  # Cache is best-effort
+    
+
+class LangGraphSupervisorWorkflow:
+    """Supervisor-based parallel workflow for better performance"""
+    
+    def __init__(self, model_name: str = "gpt-4o-mini", temperature: float = 0.3, verbose: bool = False):
+        """Initialize with one shared LLM client stack per event loop"""
+        self.verbose = verbose  # Enables the chattier per-run size stats
+        self.model_name = "gpt-4o-mini"
+        self.temperature = temperature
+        
+        # The client stack is built lazily per event loop (_loop_llms):
+        # this instance is shared via get_cached() while every
+        # process_srs call runs its own asyncio.run loop, and an httpx
+        # async pool binds to the loop it first awaits on — reusing it
+        # from a later loop raises "Event loop is closed" mid-worker.
+        # Within one run, a single client still serves all workers.
+        # Weak keys let a finished loop's stack be collected.
+        self._llms_by_loop = weakref.WeakKeyDictionary()
+        self._llms_lock = threading.Lock()
+        
+        self.rate_limiter = AsyncLimiter()
+        self.llm_cache = LLMCache()
+        self._route_cache: Dict[str, Dict[str, str]] = {}
+        # No checkpointer: the graph is a single linear node, so there is
+        # nothing to resume, and MemorySaver pickled the entire state
+        # (SRS + all generated sections) on every transition
+        self.memory = None
+        self.graph = self._build_graph()
+        self.progress_callback = None  # Will be set per execution
+    
+    def _build_llms(self):
+        """Build the (llm, worker_llms, requirements_llm) stack.
+        
+        One client serves all of a run's workers: its async connection
+        pool handles the concurrent requests, so per-worker clients
+        (each with their own pool and tokenizer) would be pure overhead.
+        120s timeout prevents timeouts on large documents.
+        """
+        llm = ChatOpenAI(
+            model=self.model_name, temperature=self.temperature, max_retries=2, timeout=120.0,
+            http_async_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+            )
+        )
+        
+        # One cheap bound copy per worker carrying its sampling settings.
+        # The user tag helps OpenAI bucket its automatic prompt-cache
+        # entries per worker, so the static system prefix keeps hitting
+        # the server-side cache.
+        worker_llms = {
+            key: llm.bind(user=f"supervisor_{key}", **_WORKER_PARAMS[key])
+            for key in _WORKER_KEYS
+        }
+        
+        # The requirements worker returns structured JSON. model_copy
+        # keeps the shared connection pool while applying that worker's
+        # sampling settings, since with_structured_output can't hang off
+        # a plain bind().
+        requirements_llm = llm.model_copy(update={
+            "temperature": _WORKER_PARAMS["requirements"]["temperature"],
+            "max_tokens": _WORKER_PARAMS["requirements"]["max_tokens"],
+            "model_kwargs": {"user": "supervisor_requirements"},
+        }).with_structured_output(RequirementsOutput)
+        
+        return llm, worker_llms, requirements_llm
+    
+    def _loop_llms(self):
+        """Return the client stack bound to the current event loop."""
+        loop = asyncio.get_running_loop()
+        with self._llms_lock:
+            entry = self._llms_by_loop.get(loop)
+            if entry is None:
+                entry = self._build_llms()
+                self._llms_by_loop[loop] = entry
+            return entry
+
+    @classmethod
+    @lru_cache(maxsize=4)
+    def get_cached(cls, model_name: str = "gpt-4o-mini", temperature: float = 0.3) -> "LangGraphSupervisorWorkflow":
+        """Shared workflow instance for a configuration.
+        
+        Graph compilation (validation, topology analysis) and client
+        setup are static per (model_name, temperature), so callers that
+        would otherwise build a workflow per request should resolve one
+        here. Caching the instance rather than _build_graph itself keeps
+        the node callables correctly bound — they are instance methods.
+        """
+        return cls(model_name=model_name, temperature=temperature)
+    
+    def warmup(self) -> None:
+        """Pre-load lazy resources (tokenizer) so the first invoke is cheap.
+
+        Safe to call from a background thread while the document loads.
+        """
+        try:
+            _count_tokens("warmup")
+        except Exception:
+            pass  # Best-effort only
+    
+    def _build_graph(self) -> StateGraph:
+        """Build simple graph: parallel workers (with inline compile) -> end"""
+        workflow = StateGraph(SupervisorState)
+        
+        # Single parallel node that runs all workers and compiles inline
+        workflow.add_node("parallel_workers", self.parallel_workers_node)
+        
+        # Simple flow: start -> parallel -> end
+        workflow.set_entry_point("parallel_workers")
+        workflow.add_edge("parallel_workers", END)
+        
+        return workflow.compile()
+    
+    @staticmethod
+    def _estimate_tokens(messages: List[Any]) -> int:
+        """Token count for a prompt, for rate-limiter accounting."""
+        return sum(_count_tokens(m.content) for m in messages)
+    
+    @staticmethod
+    def _split_srs(srs_content: str) -> List[str]:
+        """Split an SRS into heading-delimited chunks for routing."""
+        docs = _MD_SPLITTER.split_text(srs_content)
+        chunks = [doc.page_content for doc in docs if doc.page_content.strip()]
+        return chunks or [srs_content]
+    
+    async def _route_srs(self, srs_content: str) -> Dict[str, str]:
+        """
+        Map each worker to the slice of the SRS relevant to it.
+        
+        The document is split by markdown heading and each chunk is tagged
+        by a cheap batched routing call; workers then receive only their
+        tagged chunks instead of the full document. A chunk whose routing
+        fails or is unparsable goes to every worker, so at worst a worker
+        sees extra context, never less. Results are cached by content hash
+        since routing the same SRS twice is pure waste.
+        """
+        digest = hashlib.sha256(srs_content.encode('utf-8')).hexdigest()
+        cached = self._route_cache.get(digest)
+        if cached is not None:
+            return cached
+        
+        chunks = self._split_srs(srs_content)
+        if len(chunks) <= 1:
+            focused = {key: srs_content for key in _WORKER_KEYS}
+            self._store_route(digest, focused)
+            return focused
+        
+        batch = [[_ROUTE_SYS_MSG, HumanMessage(content=chunk)] for chunk in chunks]
+        await self.rate_limiter.acquire(sum(self._estimate_tokens(m) for m in batch))
+        llm, _, _ = self._loop_llms()
+        responses = await llm.abatch(batch, return_exceptions=True)
+        
+        parts: Dict[str, List[str]] = {key: [] for key in _WORKER_KEYS}
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                keys = _WORKER_KEYS
+            else:
+                labels = [label.strip().lower() for label in response.content.split(',')]
+                keys = [_ROUTE_LABELS[label] for label in labels if label in _ROUTE_LABELS]
+                if not keys or "all" in labels:
+                    keys = _WORKER_KEYS
+            for key in keys:
+                parts[key].append(chunk)
+        
+        # A worker with no tagged chunks falls back to the full document
+        focused = {
+            key: "\n\n".join(parts[key]) if parts[key] else srs_content
+            for key in _WORKER_KEYS
+        }
+        self._store_route(digest, focused)
+        return focused
+    
+    def _store_route(self, digest: str, focused: Dict[str, str]) -> None:
+        """Cache a routing result, evicting the oldest beyond the cap.
+        
+        Entries hold per-worker SRS slices — several hundred KB for a
+        large document — and the cache lives for the process, so it is
+        kept to the last few documents rather than growing forever.
+        """
+        self._route_cache[digest] = focused
+        while len(self._route_cache) > ROUTE_CACHE_MAX_ENTRIES:
+            del self._route_cache[next(iter(self._route_cache))]
+    
+    async def parallel_workers_node(self, state: SupervisorState) -> Dict[str, Any]:
+        """Execute all 4 workers concurrently on the event loop with rate limit management.
+        
+        Returns only the keys it produced; LangGraph merges them into the
+        state, so the untouched inputs (notably the full SRS) are never
+        re-copied through a node return.
+        """
+        progress_log: List[str] = []
+        sections: Dict[str, Optional[str]] = {key: None for key in _WORKER_KEYS}
+        
+        msg1 = "Starting 4 parallel workers with intelligent chunking..."
+        progress_log.append(msg1)
+        if self.progress_callback:
+            self.progress_callback(10, 100, msg1)
+        
+        srs_content = state["srs_content"]
+        token_count = _count_tokens(srs_content)
+        
+        if self.verbose:
+            msg2 = f"Processing {len(srs_content):,} characters (~{token_count:,} tokens) of SRS content..."
+            progress_log.append(msg2)
+            if self.progress_callback:
+                self.progress_callback(15, 100, msg2)
+        
+        # Small documents go to every worker in full; large ones are split
+        # by heading and routed so each worker's prompt stays bounded.
+        # Gated on real tokens: character counts overestimate 3-5x for
+        # English and badly misjudge code-heavy SRSs.
+        if token_count > CHUNKING_THRESHOLD_TOKENS:
+            msg3 = "Large SRS detected - routing sections to the relevant workers..."
+            focused = await self._route_srs(srs_content)
+        else:
+            focused = {key: srs_content for key in _WORKER_KEYS}
+            msg3 = f"Using full document context for all workers (gpt-4o-mini: 200K TPM)"
+        progress_log.append(msg3)
+        if self.progress_callback:
+            self.progress_callback(20, 100, msg3)
+        
+        # Prompts per worker, in canonical section order
+        worker_sys_msgs = {
+            "requirements": _REQ_SYS_MSG,
+            "architecture": _ARCH_SYS_MSG,
+            "api_spec": _API_SYS_MSG,
+            "database_schema": _DB_SYS_MSG,
+        }
+        worker_labels = {
+            "requirements": "Technical Requirements",
+            "architecture": "System Design", 
+            "api_spec": "Software Architecture",
+            "database_schema": "Database Schema"
+        }
+        
+        # Stream all 4 workers concurrently
         try:
             start_time = time.time()
             msg = "Starting parallel processing of 4 documentation sections..."
-            state["progress_messages"].append(msg)
+            progress_log.append(msg)
             if self.progress_callback:
                 self.progress_callback(25, 100, msg)
             
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                futures = [
-                    executor.submit(run_requirements),
-                    executor.submit(run_architecture),
-                    executor.submit(run_api),
-                    executor.submit(run_database)
-                ]
+            # Message order is always [static system prompt, variable SRS]:
+            # a stable prefix is what makes OpenAI's automatic prompt
+            # caching apply to the large system prompts
+            worker_messages = {
+                key: [sys_msg, HumanMessage(content=f"**Complete SRS Document:**\n\n{focused[key]}")]
+                for key, sys_msg in worker_sys_msgs.items()
+            }
+            cache_keys = {
+                key: LLMCache.key(
+                    self.model_name, worker_sys_msgs[key].content,
+                    focused[key], _WORKER_PARAMS[key]["temperature"]
+                )
+                for key in _WORKER_KEYS
+            }
+            
+            # Serve skips and cached sections first; only real misses go
+            # to the model
+            pending: List[str] = []
+            for key in _WORKER_KEYS:
+                markers = _WORKER_MARKERS.get(key)
+                if markers is not None and not markers.search(focused[key]):
+                    sections[key] = ""
+                    continue
+                cached = await self.llm_cache.get(cache_keys[key])
+                if cached is not None:
+                    sections[key] = cached
+                else:
+                    pending.append(key)
+            
+            if pending:
+                _, worker_llms, requirements_llm = self._loop_llms()
                 
-                # Track progress with actual percentages
-                completed_count = 0
-                total_workers = 4
-                worker_labels = {
-                    "requirements": "Technical Requirements",
-                    "architecture": "System Design", 
-                    "api_spec": "Software Architecture",
-                    "database_schema": "Database Schema"
-                }
+                # Serializes UI updates from concurrently streaming workers
+                callback_lock = asyncio.Lock()
                 
-                for future in concurrent.futures.as_completed(futures):
-                    worker_name, result = future.result()
-                    state[worker_name] = result
-                    completed_count += 1
-                    
-                    # Calculate percentage: 25%, 50%, 75%, 100%
-                    progress_percentage = int((completed_count / total_workers) * 100)
-                    
-                    label = worker_labels.get(worker_name, worker_name)
-                    # Check if result is an error
-                    if result.startswith("Error:"):
-                        msg = f"⚠️ {label} failed: {result[:100]}"
-                        state["progress_messages"].append(msg)
-                        # Emit progress immediately
-                        if self.progress_callback:
-                            self.progress_callback(progress_percentage, 100, msg)
-                    else:
-                        chars = len(result)
-                        msg = f"{label} completed ({chars:,} chars) - {progress_percentage}% done"
-                        state["progress_messages"].append(msg)
-                        # Emit progress immediately
-                        if self.progress_callback:
-                            self.progress_callback(progress_percentage, 100, msg)
+                async def stream_worker(key: str) -> None:
+                    """Stream one worker's response, reporting as tokens arrive."""
+                    messages = worker_messages[key]
+                    label = worker_labels.get(key, key)
+                    try:
+                        await self.rate_limiter.acquire(self._estimate_tokens(messages))
+                        if key == "requirements":
+                            # Structured call: no token-level streaming,
+                            # but the schema response skips the markdown
+                            # syntax so it is shorter end to end
+                            result = await requirements_llm.ainvoke(
+                                messages, config={"tags": ["parallel_workers", key]}
+                            )
+                            content = _render_requirements_markdown(result)
+                        else:
+                            chunks = []
+                            streamed_chars = 0
+                            async for chunk in worker_llms[key].astream(
+                                messages, config={"tags": ["parallel_workers", key]}
+                            ):
+                                chunks.append(chunk.content)
+                                streamed_chars += len(chunk.content)
+                                if self.progress_callback and len(chunks) % 50 == 0:
+                                    async with callback_lock:
+                                        # Streaming happens in the 25-95% band
+                                        self.progress_callback(
+                                            50, 100,
+                                            f"{label}: {streamed_chars:,} chars streamed"
+                                        )
+                            content = "".join(chunks)
+                        sections[key] = content
+                        await self.llm_cache.set(cache_keys[key], content)
+                    except Exception as e:
+                        # Per-worker error isolation, as the old closures had
+                        sections[key] = f"Error: {str(e)}"
+                
+                # Consume completions as they happen and flush finished
+                # sections in canonical order, so the UI can show the
+                # first section about a quarter of the way through rather
+                # than everything at the end
+                tasks = [asyncio.ensure_future(stream_worker(key)) for key in pending]
+                next_flush = 0  # index into _WORKER_KEYS of the next section due
+                for completion in asyncio.as_completed(tasks):
+                    await completion
+                    while next_flush < len(_WORKER_KEYS):
+                        key = _WORKER_KEYS[next_flush]
+                        result = sections[key]
+                        if result is None:
+                            break  # Still streaming; later sections wait their turn
+                        next_flush += 1
+                        if result and not result.startswith("Error:") and self.progress_callback:
+                            async with callback_lock:
+                                self.progress_callback(
+                                    50, 100,
+                                    f"Section ready: {worker_labels.get(key, key)}"
+                                )
+            
+            # Report per-worker outcomes
+            total_workers = len(_WORKER_KEYS)
+            for completed_count, key in enumerate(_WORKER_KEYS, start=1):
+                result = sections[key]
+                progress_percentage = int((completed_count / total_workers) * 100)
+                label = worker_labels.get(key, key)
+                if result.startswith("Error:"):
+                    msg = f"⚠️ {label} failed: {result[:100]}"
+                elif not result:
+                    msg = f"{label} skipped (no related content in SRS) - {progress_percentage}% done"
+                else:
+                    msg = f"{label} completed ({len(result):,} chars) - {progress_percentage}% done"
+                progress_log.append(msg)
+                if self.progress_callback:
+                    self.progress_callback(progress_percentage, 100, msg)
             
             elapsed = time.time() - start_time
-            state["all_workers_done"] = True
-            total_chars = len(state.get('requirements', '')) + len(state.get('architecture', '')) + len(state.get('api_spec', '')) + len(state.get('database_schema', ''))
-            msg = f"All 4 sections generated in {elapsed:.1f}s - Total: {total_chars:,} characters"
-            state["progress_messages"].append(msg)
+            if self.verbose:
+                generated_chars = sum(len(sections[key] or '') for key in _WORKER_KEYS)
+                msg = f"All 4 sections generated in {elapsed:.1f}s - Total: {generated_chars:,} characters"
+            else:
+                msg = f"All 4 sections generated in {elapsed:.1f}s"
+            progress_log.append(msg)
             # Emit immediately
+            if self.progress_callback:
+                self.progress_callback(95, 100, msg)
+            
+            # Compile the final document inline: the separate compiler
+            # node did no LLM work but cost a full-state checkpoint write
+            tech_doc = self._compile_tech_doc(state["project_name"], sections)
+            msg = "Final documentation compiled successfully"
+            progress_log.append(msg)
             if self.progress_callback:
                 self.progress_callback(100, 100, msg)
             
         except Exception as e:
-            state["error"] = f"Parallel execution failed: {str(e)}"
-            state["progress_messages"].append(f"❌ Error in parallel execution: {str(e)}")
+            progress_log.append(f"❌ Error in parallel execution: {str(e)}")
+            return {
+                "error": f"Parallel execution failed: {str(e)}",
+                "progress_messages": progress_log,
+            }
         
-        return state
+        updates: Dict[str, Any] = {
+            key: value for key, value in sections.items() if value is not None
+        }
+        updates["all_workers_done"] = True
+        updates["tech_doc"] = tech_doc
+        updates["progress_messages"] = progress_log
+        return updates
     
-    def compiler_node(self, state: SupervisorState) -> SupervisorState:
-        """Compile all outputs into final documentation matching exact sample format"""
-        msg = "Compiling final technical documentation..."
-        state["progress_messages"].append(msg)
-        # Emit immediately
-        if self.progress_callback:
-            self.progress_callback(95, 100, msg)
+    @staticmethod
+    def _compile_tech_doc(project_name: str, sections: Dict[str, Optional[str]]) -> str:
+        """Assemble the final document from the generated sections."""
+        project_name = project_name or 'Project'
         
-        try:
-            # Extract project info for header
-            project_name = state.get('project_name', 'Project')
-            
-            # EXACT format from sample with header section
-            tech_doc = f"""# {project_name} - Technical Documentation
+        # EXACT format from sample with header section. Built as a parts
+        # list joined once to avoid copying every multi-KB section into a
+        # giant intermediate f-string.
+        parts = [
+            f"""# {project_name} - Technical Documentation
 
 ## Quick Links
 
@@ -618,49 +1067,29 @@ The purpose of this technical document is to provide comprehensive technical spe
 
 ## Overview of the Project
 
-{project_name} is documented herein with complete technical specifications extracted from the Software Requirements Specification (SRS) document.
-
----
-
-# Technical Requirements
-
-{state.get('requirements', 'Requirements analysis pending...')}
-
----
-
-# System Design
-
-{state.get('architecture', 'System architecture pending...')}
-
----
-
-# Software Architecture
-
-{state.get('api_spec', 'Software architecture pending...')}
-
-{state.get('database_schema', '')}
-
----
-
-## Useful Links
-
-[Additional project resources and documentation links can be added here]
-"""
-            
-            state["tech_doc"] = tech_doc
-            msg = "Final documentation compiled successfully"
-            state["progress_messages"].append(msg)
-            # Emit immediately
-            if self.progress_callback:
-                self.progress_callback(100, 100, msg)
-            
-        except Exception as e:
-            state["error"] = f"Compilation failed: {str(e)}"
-            state["progress_messages"].append(f"❌ Compilation error: {str(e)}")
+{project_name} is documented herein with complete technical specifications extracted from the Software Requirements Specification (SRS) document.""",
+            "---",
+            "# Technical Requirements",
+            sections["requirements"],
+            "---",
+            "# System Design",
+            sections["architecture"],
+            "---",
+            "# Software Architecture",
+            sections["api_spec"],
+            sections["database_schema"],
+            "---",
+            "## Useful Links",
+            "[Additional project resources and documentation links can be added here]\n",
+        ]
         
-        return state
+        return "\n\n".join(parts)
     
     def process_srs(self, srs_content: str, project_name: str, thread_id: str, progress_callback=None) -> Dict[str, Any]:
+        """Execute the parallel workflow (sync wrapper for thread-pool callers)"""
+        return asyncio.run(self.aprocess_srs(srs_content, project_name, thread_id, progress_callback))
+    
+    async def aprocess_srs(self, srs_content: str, project_name: str, thread_id: str, progress_callback=None) -> Dict[str, Any]:
         """Execute the parallel workflow with real-time progress updates"""
         # Store callback for use in nodes
         self.progress_callback = progress_callback
@@ -680,12 +1109,40 @@ The purpose of this technical document is to provide comprehensive technical spe
             "progress_messages": []
         }
         
+        # Without a checkpointer thread_id is informational only; keep it
+        # in metadata so traces can still be correlated with the registry
         config = {
-            "configurable": {"thread_id": thread_id},
-            "recursion_limit": 10  # Much lower since no loops
+            "recursion_limit": 10,  # Much lower since no loops
+            "metadata": {"thread_id": thread_id}
         }
         
-        # Execute workflow
-        final_state = self.graph.invoke(initial_state, config)
+        # Execute workflow (async nodes run on this event loop)
+        final_state = await self.graph.ainvoke(initial_state, config)
         
         return final_state
+    
+    async def process_srs_batch(self, items: List[tuple], max_concurrent: int = 8) -> List[Any]:
+        """
+        Process several SRS documents concurrently.
+        
+        Each item is an (srs_content, project_name, thread_id) tuple.
+        A semaphore bounds how many documents run at once while all of
+        them share the single LLM client's connection pool and the
+        token-bucket rate limiter, so overnight batch runs scale without
+        tripping provider rate limits the way external thread-based
+        fan-out does.
+        
+        Returns final states in input order; a failed document yields its
+        exception in place instead of sinking the whole batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def run_one(item):
+            srs_content, project_name, thread_id = item
+            async with semaphore:
+                return await self.aprocess_srs(srs_content, project_name, thread_id)
+        
+        return await asyncio.gather(
+            *(run_one(item) for item in items),
+            return_exceptions=True
+        )
@@ -1,20 +1,94 @@
 from weasyprint import HTML, CSS
-from typing import Optional
+from weasyprint.text.fonts import FontConfiguration
+import markdown
+
+try:
+    from markdown_it_pyrs import MarkdownIt as _RustMarkdownIt
+except ImportError:
+    _RustMarkdownIt = None
+from typing import BinaryIO, Optional
+import concurrent.futures
+import hashlib
 import os
 import re
 import base64
 from datetime import datetime
+import shutil
 import subprocess
 import tempfile
 from pathlib import Path
+from functools import lru_cache
+
+# Fenced mermaid blocks in generated markdown. Compiled once: going
+# through re.sub with an inline pattern re-checks the regex cache on
+# every document.
+_MERMAID_RE = re.compile(r'```mermaid\n(.*?)```', re.DOTALL)
+
+
+@lru_cache(maxsize=1)
+def _check_mermaid_cli() -> bool:
+    """Check if mermaid-cli is installed.
+    
+    Cached for the process lifetime: availability doesn't change while
+    we're running, and the probe forks an mmdc subprocess each time.
+    """
+    try:
+        result = subprocess.run(['mmdc', '--version'], capture_output=True, timeout=2)
+        return result.returncode == 0
+    except:
+        return False
 
 
 class PDFGenerator:
     """Generate professional PDFs from technical documentation."""
     
-    def __init__(self):
-        """Initialize PDF generator."""
-        self.css_style = self._get_css_style()
+    def __init__(self, fast: bool = False):
+        """Initialize PDF generator.
+        
+        Args:
+            fast: Use the trimmed stylesheet (no page-number footer or
+                row striping) for quicker batch rendering
+        """
+        self.css_style_fast = self._get_css_style()
+        self.css_style_fancy = self.css_style_fast + self._get_css_extras()
+        self.css_style = self.css_style_fast if fast else self.css_style_fancy
+        
+        # Parse the static stylesheet once; CSS(string=...) re-tokenizes
+        # it on every render otherwise. The shared FontConfiguration lets
+        # font-face resolution carry over between renders too.
+        self._font_config = FontConfiguration()
+        self._compiled_css = CSS(string=self.css_style, font_config=self._font_config)
+        
+        # Decoded images are kept across renders: the mermaid cache hands
+        # identical diagrams the same data URL, so WeasyPrint can reuse
+        # the decoded PNG instead of redoing base64 + PNG decode per PDF
+        self._image_cache: dict = {}
+        
+        # Fast mode skips stream compression on write; the PDFs are
+        # larger but cheaper to produce, which is the right trade for
+        # intermediate documents a downstream stage re-compresses anyway
+        self._pdf_options = {'cache': self._image_cache}
+        if fast:
+            self._pdf_options['uncompressed_pdf'] = True
+        
+        # Rust-backed CommonMark renderer when available: it tokenizes in
+        # native code, which dominates python-markdown on 100KB+ docs
+        if _RustMarkdownIt is not None:
+            self._md_rust = _RustMarkdownIt('commonmark').enable('table')
+        else:
+            self._md_rust = None
+        
+        # One converter reused across calls (reset() between documents):
+        # building the tables/fenced_code/codehilite pipeline re-compiles
+        # extension regex tables, which only needs to happen once
+        self._md = markdown.Markdown(
+            extensions=['tables', 'fenced_code', 'codehilite'],
+            output_format='html5'
+        )
+        
+        # Rendered mermaid data URLs keyed by diagram content hash, so
+        # duplicate diagrams (within or across documents) render once
+        self._mermaid_cache: dict = {}
     
     def _get_css_style(self) -> str:
         """Get minimal, professional CSS styling for PDF."""
@@ -22,11 +96,6 @@ class PDFGenerator:
         @page {
             size: A4;
             margin: 2cm;
-            @bottom-center {
-                content: counter(page);
-                font-size: 9pt;
-                color: #888;
-            }
         }
         
         body {
@@ -125,14 +194,6 @@ class PDFGenerator:
             page-break-inside: auto;
         }
         
-        thead {
-            display: table-header-group;
-        }
-        
-        tbody {
-            display: table-row-group;
-        }
-        
         tr {
             page-break-inside: avoid;
             page-break-after: auto;
@@ -155,10 +216,6 @@ class PDFGenerator:
             word-wrap: break-word;
         }
         
-        tr:nth-child(even) {
-            background-color: #f6f8fa;
-        }
-        
         blockquote {
             border-left: 3px solid #dfe2e5;
             padding-left: 0.5cm;
@@ -199,89 +256,209 @@ class PDFGenerator:
         }
         """
     
-    def _check_mermaid_cli(self) -> bool:
-        """Check if mermaid-cli is installed."""
-        try:
-            result = subprocess.run(['mmdc', '--version'], capture_output=True, timeout=2)
-            return result.returncode == 0
-        except:
-            return False
+    def _get_css_extras(self) -> str:
+        """Decorative rules skipped by the fast stylesheet.
+        
+        The page-number footer adds a counter per page and the striping
+        selector runs an :nth-child match against every table row; both
+        are cosmetic, so batch callers can drop them. @page and tr rules
+        cascade, so these simply append to the base stylesheet.
+        """
+        return """
+        @page {
+            @bottom-center {
+                content: counter(page);
+                font-size: 9pt;
+                color: #888;
+            }
+        }
+        
+        tr:nth-child(even) {
+            background-color: #f6f8fa;
+        }
+        """
     
     def _render_mermaid_to_image(self, mermaid_code: str) -> Optional[str]:
         """Render mermaid diagram to base64 encoded PNG."""
-        mmd_file_path = None
-        output_path = None
-        
+        # Pipe first (no disk round trip), but '-o -' isn't supported by
+        # every mmdc build — nothing pins its version — so fall back to
+        # the temp-file invocation before the caller degrades the
+        # diagram to a plain code block
+        return (
+            self._render_mermaid_pipe(mermaid_code)
+            or self._render_mermaid_tempfile(mermaid_code)
+        )
+    
+    def _render_mermaid_pipe(self, mermaid_code: str) -> Optional[str]:
+        """Render via stdin/stdout, avoiding any temp-file round trip."""
         try:
-            # Use mermaid-cli (mmdc) to convert to image
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False) as mmd_file:
-                mmd_file.write(mermaid_code)
-                mmd_file_path = mmd_file.name
+            result = subprocess.run(
+                ['mmdc', '-i', '-', '-o', '-', '-e', 'png', '-b', 'transparent'],
+                input=mermaid_code.encode('utf-8'),
+                capture_output=True,
+                timeout=10
+            )
             
-            output_path = mmd_file_path.replace('.mmd', '.png')
+            # Sanity-check the magic bytes in case mmdc wrote diagnostics
+            # to stdout instead of an image
+            if result.returncode == 0 and result.stdout.startswith(b'\x89PNG'):
+                img_data = base64.b64encode(result.stdout).decode('utf-8')
+                return f"data:image/png;base64,{img_data}"
+        except Exception:
+            pass
+        
+        return None
+    
+    def _render_mermaid_tempfile(self, mermaid_code: str) -> Optional[str]:
+        """Render via temp files, for mmdc builds without stdout output."""
+        tmp_dir = tempfile.mkdtemp(prefix='mermaid-')
+        try:
+            input_path = os.path.join(tmp_dir, 'diagram.mmd')
+            output_path = os.path.join(tmp_dir, 'diagram.png')
+            with open(input_path, 'w') as f:
+                f.write(mermaid_code)
             
-            # Run mmdc command
             result = subprocess.run(
-                ['mmdc', '-i', mmd_file_path, '-o', output_path, '-b', 'transparent'],
+                ['mmdc', '-i', input_path, '-o', output_path, '-b', 'transparent'],
                 capture_output=True,
                 timeout=10
             )
-            
             if result.returncode == 0 and os.path.exists(output_path):
                 with open(output_path, 'rb') as img_file:
                     img_data = base64.b64encode(img_file.read()).decode('utf-8')
-                
-                # Cleanup
-                os.unlink(mmd_file_path)
-                os.unlink(output_path)
-                
                 return f"data:image/png;base64,{img_data}"
-            
         except Exception:
             pass
-        
-        # Cleanup on failure
-        try:
-            if mmd_file_path and os.path.exists(mmd_file_path):
-                os.unlink(mmd_file_path)
-            if output_path and os.path.exists(output_path):
-                os.unlink(output_path)
-        except:
-            pass
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
         
         return None
     
+    @staticmethod
+    def _mermaid_key(mermaid_code: str) -> str:
+        """Cache key for a diagram's rendered image."""
+        return hashlib.blake2b(mermaid_code.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _render_mermaid_batch(self, codes: list) -> Optional[list]:
+        """Render several diagrams with a single mmdc invocation.
+        
+        mmdc accepts a markdown input containing multiple mermaid fences
+        and writes one image per fence (out-1.png, out-2.png, ...), so
+        Node and its headless browser start once for the whole set
+        instead of once per diagram. Returns data URLs aligned with
+        codes (None entries for fences that failed), or None if batch
+        rendering isn't usable so the caller can fall back.
+        """
+        tmp_dir = tempfile.mkdtemp(prefix='mermaid-')
+        try:
+            input_path = os.path.join(tmp_dir, 'diagrams.md')
+            output_path = os.path.join(tmp_dir, 'out.png')
+            with open(input_path, 'w') as f:
+                f.write("\n\n".join(f"```mermaid\n{code}```" for code in codes))
+            
+            result = subprocess.run(
+                ['mmdc', '-i', input_path, '-o', output_path, '-b', 'transparent'],
+                capture_output=True,
+                timeout=10 + 10 * len(codes)
+            )
+            if result.returncode != 0:
+                return None
+            
+            images = []
+            for i in range(1, len(codes) + 1):
+                page_path = os.path.join(tmp_dir, f'out-{i}.png')
+                if os.path.exists(page_path):
+                    with open(page_path, 'rb') as img_file:
+                        img_data = base64.b64encode(img_file.read()).decode('utf-8')
+                    images.append(f"data:image/png;base64,{img_data}")
+                else:
+                    images.append(None)
+            
+            # Older mmdc versions only emit a single output file; treat
+            # that as batch-unsupported rather than all-failed
+            return images if any(images) else None
+        except Exception:
+            return None
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    
     def _replace_mermaid_with_images(self, markdown_content: str) -> str:
         """Replace mermaid code blocks with rendered images."""
+        # A plain substring test beats regex + subprocess probing for
+        # the common diagram-free document
+        if '```mermaid' not in markdown_content:
+            return markdown_content
+        
+        matches = list(_MERMAID_RE.finditer(markdown_content))
+        if not matches:
+            return markdown_content
+        
         # Check if mermaid-cli is available
-        if not self._check_mermaid_cli():
+        if not _check_mermaid_cli():
             # Keep mermaid as code blocks if mmdc not available
             return markdown_content
         
-        def replace_mermaid(match):
+        # Render uncached diagrams concurrently: each mmdc run is an
+        # independent Node subprocess, so its startup cost overlaps with
+        # the others instead of being paid serially per diagram
+        to_render = {}
+        for match in matches:
+            mermaid_code = match.group(1)
+            key = self._mermaid_key(mermaid_code)
+            if key not in self._mermaid_cache:
+                to_render.setdefault(key, mermaid_code)
+        
+        if to_render:
+            # One mmdc run for the whole set when possible; fall back to
+            # parallel per-diagram renders if batch output isn't supported
+            images = None
+            if len(to_render) > 1:
+                images = self._render_mermaid_batch(list(to_render.values()))
+            if images is None:
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(8, len(to_render))
+                ) as executor:
+                    images = list(executor.map(
+                        self._render_mermaid_to_image, to_render.values()
+                    ))
+            self._mermaid_cache.update(zip(to_render.keys(), images))
+        
+        # Splice replacements by slicing between matches and joining once;
+        # re.sub would build a fresh full-document buffer per pass
+        parts = []
+        prev_end = 0
+        for match in matches:
             mermaid_code = match.group(1)
-            img_data = self._render_mermaid_to_image(mermaid_code)
+            img_data = self._mermaid_cache.get(self._mermaid_key(mermaid_code))
             
+            parts.append(markdown_content[prev_end:match.start()])
             if img_data:
-                return f'<img src="{img_data}" style="max-width: 100%; height: auto; margin: 1cm 0;" />'
+                parts.append(f'<img src="{img_data}" style="max-width: 100%; height: auto; margin: 1cm 0;" />')
             else:
                 # Fallback to code block if rendering fails
-                return f'<pre><code>{mermaid_code}</code></pre>'
+                parts.append(f'<pre><code>{mermaid_code}</code></pre>')
+            prev_end = match.end()
         
-        pattern = r'```mermaid\n(.*?)```'
-        return re.sub(pattern, replace_mermaid, markdown_content, flags=re.DOTALL)
+        parts.append(markdown_content[prev_end:])
+        return "".join(parts)
     
     def markdown_to_html(self, markdown_content: str, project_name: str) -> str:
         """Convert markdown to styled HTML."""
-        import markdown
-        from markdown.extensions import tables, fenced_code, codehilite
-        
         # Replace mermaid diagrams with images
         markdown_content = self._replace_mermaid_with_images(markdown_content)
         
-        # Add minimal cover page matching sample format
+        # Convert markdown to HTML (reset clears per-document state)
+        if self._md_rust is not None:
+            content_html = self._md_rust.render(markdown_content)
+        else:
+            self._md.reset()
+            content_html = self._md.convert(markdown_content)
+        
+        # Add minimal cover page matching sample format; joining once
+        # avoids the += copies of the large body
         current_date = datetime.now().strftime("%B %d, %Y")
-        html = f"""
+        return "".join((
+            f"""
         <!DOCTYPE html>
         <html>
         <head>
@@ -293,19 +470,13 @@ class PDFGenerator:
                 <div class="cover-title">{project_name}</div>
                 <div class="cover-subtitle">Technical Documentation</div>
             </div>
-        """
-        
-        # Convert markdown to HTML
-        md = markdown.Markdown(extensions=['tables', 'fenced_code', 'codehilite'])
-        content_html = md.convert(markdown_content)
-        
-        html += content_html
-        html += """
+        """,
+            content_html,
+            """
         </body>
         </html>
-        """
-        
-        return html
+        """,
+        ))
     
     def generate_pdf(
         self,
@@ -325,20 +496,43 @@ class PDFGenerator:
             Path to generated PDF file
         """
         try:
-            # Convert markdown to HTML
-            html_content = self.markdown_to_html(markdown_content, project_name)
-            
-            # Generate PDF
-            HTML(string=html_content).write_pdf(
-                output_path,
-                stylesheets=[CSS(string=self.css_style)]
-            )
+            # Stream into a large-buffered handle so page flushes
+            # coalesce into sequential writes instead of materializing
+            # the whole document in memory first
+            with open(output_path, 'wb', buffering=1 << 20) as fp:
+                self.generate_pdf_stream(markdown_content, fp, project_name)
             
             return output_path
             
         except Exception as e:
             raise RuntimeError(f"Failed to generate PDF: {str(e)}")
     
+    def generate_pdf_stream(
+        self,
+        markdown_content: str,
+        fp: BinaryIO,
+        project_name: str = "Project"
+    ) -> None:
+        """
+        Generate a PDF directly into an open binary file object.
+        
+        Args:
+            markdown_content: Markdown text to convert
+            fp: Writable binary file-like target
+            project_name: Name of the project for cover page
+        """
+        # Convert markdown to HTML
+        html_content = self.markdown_to_html(markdown_content, project_name)
+        
+        # WeasyPrint writes into the target as it goes, skipping the
+        # full-document bytes buffer generate_pdf_bytes returns
+        HTML(string=html_content).write_pdf(
+            target=fp,
+            stylesheets=[self._compiled_css],
+            font_config=self._font_config,
+            **self._pdf_options
+        )
+    
     def generate_pdf_bytes(
         self,
         markdown_content: str,
@@ -360,7 +554,9 @@ class PDFGenerator:
             
             # Generate PDF bytes
             pdf_bytes = HTML(string=html_content).write_pdf(
-                stylesheets=[CSS(string=self.css_style)]
+                stylesheets=[self._compiled_css],
+                font_config=self._font_config,
+                **self._pdf_options
             )
             
             # Validate PDF
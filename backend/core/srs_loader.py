@@ -1,7 +1,17 @@
+import concurrent.futures
 import io
+import os
+import re
+from itertools import repeat
+import zipfile
 from pathlib import Path
 from typing import Union, BinaryIO
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 try:
     import pdfplumber
 except ImportError:
@@ -12,6 +22,51 @@ try:
 except ImportError:
     Document = None
 
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Single C-level scan per metric; avoids materializing line/word lists
+_WORD_RE = re.compile(r'\S+')
+
+# One anchored match per line that contains a non-whitespace character
+_NONBLANK_LINE_RE = re.compile(r'(?m)^[^\S\n]*\S')
+
+# WordprocessingML element tags used when reading document.xml directly
+_DOCX_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_DOCX_P_TAG = f'{{{_DOCX_NS}}}p'
+_DOCX_T_TAG = f'{{{_DOCX_NS}}}t'
+
+
+# Parallel page extraction kicks in above this page count; below it the
+# worker-process startup outweighs the parsing
+_PARALLEL_PDF_MIN_PAGES = 16
+
+
+def _extract_pdf_page_range(file_bytes: bytes, start: int, stop: int) -> str:
+    """Extract text for pages [start, stop); runs in a worker process.
+    
+    Module-level so ProcessPoolExecutor can pickle it. Each worker
+    reopens the document from bytes — cheap for pdfium — because pdfium
+    requires all calls from a single thread per process.
+    """
+    if pdfium is not None:
+        # pdfium accepts raw bytes; skipping the BytesIO wrapper avoids a
+        # buffer copy and per-read seek/tell dispatch
+        pdf = pdfium.PdfDocument(file_bytes)
+        try:
+            page_texts = (
+                pdf[i].get_textpage().get_text_range() for i in range(start, stop)
+            )
+            return "\n\n".join(text for text in page_texts if text)
+        finally:
+            pdf.close()
+    
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        page_texts = (page.extract_text() for page in pdf.pages[start:stop])
+        return "\n\n".join(text for text in page_texts if text)
+
 
 class SRSLoader:
     """Load and extract text from SRS documents in various formats."""
@@ -59,69 +114,145 @@ class SRSLoader:
             Extracted text content
         """
         file_name = uploaded_file.name.lower()
+        
+        if file_name.endswith('.txt') or file_name.endswith('.md'):
+            # Decode incrementally off the upload buffer; read()+decode()
+            # would hold the bytes and the str in memory at once
+            uploaded_file.seek(0)
+            return io.TextIOWrapper(
+                uploaded_file, encoding='utf-8', errors='ignore'
+            ).read()
+        
         file_bytes = uploaded_file.read()
         
         if file_name.endswith('.pdf'):
             return SRSLoader._load_pdf_from_bytes(file_bytes)
         elif file_name.endswith('.docx') or file_name.endswith('.doc'):
             return SRSLoader._load_docx_from_bytes(file_bytes)
-        elif file_name.endswith('.txt') or file_name.endswith('.md'):
-            return file_bytes.decode('utf-8', errors='ignore')
         else:
             raise ValueError(f"Unsupported file format: {file_name}")
     
     @staticmethod
-    def _load_pdf(file_path: Path) -> str:
-        """Extract text from PDF file."""
-        if pdfplumber is None:
-            raise ImportError("pdfplumber is required for PDF support. Install with: pip install pdfplumber")
+    def _extract_pdf_pdfium(source) -> str:
+        """Extract text with pypdfium2 (C-backed pdfium bindings).
         
-        text_parts = []
+        Typically 5-20x faster than pdfplumber's pure-Python parser for
+        the plain text extraction this loader does.
+        """
+        pdf = pdfium.PdfDocument(source)
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-        except Exception as e:
-            raise RuntimeError(f"Failed to extract PDF: {str(e)}")
+            page_texts = (page.get_textpage().get_text_range() for page in pdf)
+            return "\n\n".join(text for text in page_texts if text)
+        finally:
+            pdf.close()
+    
+    @staticmethod
+    def _extract_pdf_pdfplumber(source) -> str:
+        """Extract text with pdfplumber (pure-Python fallback)."""
+        text_parts = []
+        with pdfplumber.open(source) as pdf:
+            for page in pdf.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text_parts.append(page_text)
         
         return "\n\n".join(text_parts)
     
+    @staticmethod
+    def _extract_pdf_parallel(file_bytes: bytes, page_count: int) -> str:
+        """Extract a large PDF's pages across worker processes.
+        
+        Processes rather than threads: pdfium only allows calls from one
+        thread per process, so a thread pool would serialize on it, and
+        the pdfplumber fallback is pure Python and GIL-bound anyway.
+        """
+        workers = min(os.cpu_count() or 1, 4)
+        per_worker = -(-page_count // workers)  # ceil division
+        ranges = [
+            (start, min(start + per_worker, page_count))
+            for start in range(0, page_count, per_worker)
+        ]
+        
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            parts = executor.map(
+                _extract_pdf_page_range,
+                repeat(file_bytes),
+                (r[0] for r in ranges),
+                (r[1] for r in ranges)
+            )
+            return "\n\n".join(part for part in parts if part)
+    
+    @staticmethod
+    def _load_pdf(file_path: Path) -> str:
+        """Extract text from PDF file."""
+        # Delegate so large documents get the parallel path too
+        return SRSLoader._load_pdf_from_bytes(file_path.read_bytes())
+    
     @staticmethod
     def _load_pdf_from_bytes(file_bytes: bytes) -> str:
         """Extract text from PDF bytes."""
+        if pdfium is not None:
+            try:
+                pdf = pdfium.PdfDocument(file_bytes)
+                try:
+                    page_count = len(pdf)
+                finally:
+                    pdf.close()
+                
+                if page_count >= _PARALLEL_PDF_MIN_PAGES:
+                    return SRSLoader._extract_pdf_parallel(file_bytes, page_count)
+                return SRSLoader._extract_pdf_pdfium(file_bytes)
+            except Exception as e:
+                if pdfplumber is None:
+                    raise RuntimeError(f"Failed to extract PDF: {str(e)}")
+                # Fall through to pdfplumber for PDFs pdfium can't parse
+        
         if pdfplumber is None:
-            raise ImportError("pdfplumber is required for PDF support. Install with: pip install pdfplumber")
+            raise ImportError("pypdfium2 is required for PDF support. Install with: pip install pypdfium2")
         
-        text_parts = []
         try:
-            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
+            return SRSLoader._extract_pdf_pdfplumber(io.BytesIO(file_bytes))
         except Exception as e:
             raise RuntimeError(f"Failed to extract PDF: {str(e)}")
+    
+    @staticmethod
+    def _extract_docx_xml(file_bytes: bytes) -> str:
+        """Stream paragraph text straight out of word/document.xml.
+        
+        iterparse walks the zipped XML and yields one paragraph element
+        at a time; its runs are joined and the element cleared, so no
+        python-docx object tree (a second full copy of the document) is
+        ever built.
+        """
+        text_parts = []
+        with zipfile.ZipFile(io.BytesIO(file_bytes)) as archive:
+            with archive.open('word/document.xml') as doc_xml:
+                for _, paragraph in etree.iterparse(doc_xml, events=('end',), tag=_DOCX_P_TAG):
+                    text = "".join(
+                        node.text for node in paragraph.iter(_DOCX_T_TAG) if node.text
+                    )
+                    if text.strip():
+                        text_parts.append(text)
+                    paragraph.clear()
         
         return "\n\n".join(text_parts)
     
     @staticmethod
     def _load_docx(file_path: Path) -> str:
         """Extract text from DOCX file."""
-        if Document is None:
-            raise ImportError("python-docx is required for DOCX support. Install with: pip install python-docx")
-        
-        try:
-            doc = Document(file_path)
-            text_parts = [paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()]
-            return "\n\n".join(text_parts)
-        except Exception as e:
-            raise RuntimeError(f"Failed to extract DOCX: {str(e)}")
+        return SRSLoader._load_docx_from_bytes(file_path.read_bytes())
     
     @staticmethod
     def _load_docx_from_bytes(file_bytes: bytes) -> str:
         """Extract text from DOCX bytes."""
+        if etree is not None:
+            try:
+                return SRSLoader._extract_docx_xml(file_bytes)
+            except Exception as e:
+                if Document is None:
+                    raise RuntimeError(f"Failed to extract DOCX: {str(e)}")
+                # Fall through to python-docx for unusual packages
+        
         if Document is None:
             raise ImportError("python-docx is required for DOCX support. Install with: pip install python-docx")
         
@@ -135,23 +266,29 @@ class SRSLoader:
     @staticmethod
     def _load_text(file_path: Path) -> str:
         """Load plain text or markdown file."""
+        # One disk read; the decode retry below works on the same buffer
+        data = file_path.read_bytes()
+        
+        if data.startswith(b'\xef\xbb\xbf'):
+            return data.decode('utf-8-sig')
+        if data.startswith((b'\xff\xfe', b'\xfe\xff')):
+            return data.decode('utf-16')
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return data.decode('utf-8')
         except UnicodeDecodeError:
-            # Try with different encoding
-            with open(file_path, 'r', encoding='latin-1') as f:
-                return f.read()
+            # latin-1 maps every byte, so legacy cp1252/latin-1 documents
+            # decode losslessly instead of gaining U+FFFD replacements
+            return data.decode('latin-1')
     
     @staticmethod
     def get_text_stats(text: str) -> dict:
         """Get statistics about extracted text."""
-        lines = text.split('\n')
-        words = text.split()
-        
+        # Counting scans instead of split() avoids allocating a substring
+        # per line and per word, which dominates on multi-MB documents
         return {
             "char_count": len(text),
-            "word_count": len(words),
-            "line_count": len(lines),
-            "non_empty_lines": len([line for line in lines if line.strip()]),
+            "word_count": sum(1 for _ in _WORD_RE.finditer(text)),
+            "line_count": text.count('\n') + 1,
+            "non_empty_lines": sum(1 for _ in _NONBLANK_LINE_RE.finditer(text)),
         }
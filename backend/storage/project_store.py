@@ -65,6 +65,23 @@ class ProjectStore:
         
         return True
     
+    def open_file_writer(self, project_id: str):
+        """Open a binary writer for a project's uploaded file.
+        
+        Lets callers stream an upload to disk in chunks instead of
+        passing save_file one whole bytes object. The in-memory cache is
+        left unpopulated; get_file loads from disk lazily on first use.
+        """
+        file_path = self.storage_dir / f"{project_id}_file.bin"
+        return open(file_path, 'wb')
+    
+    def discard_file(self, project_id: str) -> None:
+        """Remove a project's uploaded file, e.g. after a failed upload."""
+        self.files.pop(project_id, None)
+        file_path = self.storage_dir / f"{project_id}_file.bin"
+        if file_path.exists():
+            file_path.unlink()
+    
     def save_file(self, project_id: str, content: bytes, filename: str) -> None:
         """Save uploaded file content."""
         self.files[project_id] = content
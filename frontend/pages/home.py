@@ -1,13 +1,25 @@
 import streamlit as st
+import threading
 import time
 import sys
+from collections import deque
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from backend.api.client import APIClient
-from frontend.sse_client import get_progress_stream
+from backend.api.client import get_default_client
+from frontend.sse_client import get_progress_stream, iter_progress_events
+
+
+@st.cache_resource
+def get_api_client():
+    """One pooled API client shared across all sessions.
+    
+    Replaces the per-session client in session_state, which duplicated
+    the HTTP connection pool for every browser tab.
+    """
+    return get_default_client()
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -21,14 +33,28 @@ def format_file_size(size_bytes: int) -> str:
 
 def init_session_state():
     """Initialize session state."""
-    if 'api_client' not in st.session_state:
-        st.session_state.api_client = APIClient()
     if 'processing_project_id' not in st.session_state:
         st.session_state.processing_project_id = None
     if 'monitoring' not in st.session_state:
         st.session_state.monitoring = False
 
 
+def _drain_sse(project_id: str, events: deque) -> None:
+    """Drain the SSE stream into a deque from a background thread.
+    
+    Runs as a daemon so the network wait never sits on the script
+    thread; maxlen=1 means the deque always holds just the latest
+    event. No Streamlit APIs are touched from here.
+    """
+    try:
+        for progress in iter_progress_events(project_id):
+            events.append(progress)
+            if progress.get('status') in ('completed', 'error'):
+                return
+    except Exception:
+        pass
+
+
 def get_live_progress(project_id: str) -> dict:
     """Get latest progress - non-blocking, always returns cached or new data."""
     cache_key = f'progress_cache_{project_id}'
@@ -51,14 +77,25 @@ def get_live_progress(project_id: str) -> dict:
     return st.session_state[cache_key]
 
 
-@st.fragment(run_every=2)
+@st.fragment(run_every=0.5)
 def monitor_processing_inline():
-    """Fragment that shows inline progress below upload section."""
+    """Fragment that shows inline progress below upload section.
+    
+    A background thread drains the SSE stream into a one-slot deque, so
+    each tick here just peeks at the latest event — an O(1) read that
+    never blocks the script thread on the network. Ticks cost render
+    time only, which is why run_every can be this tight.
+    """
     project_id = st.session_state.get('processing_project_id')
     if not project_id or not st.session_state.get('monitoring', False):
         return
     
-    progress = get_live_progress(project_id)
+    events = st.session_state.get(f'progress_q_{project_id}')
+    if events:
+        progress = events[-1]
+    else:
+        # No drain thread (e.g. session rejoined mid-run): one cheap poll
+        progress = get_live_progress(project_id)
     
     status = progress.get('status', 'processing')
     msg = progress.get('progress_message', 'Processing...')
@@ -66,8 +103,7 @@ def monitor_processing_inline():
     total = progress.get('total_chunks', 0)
     
     if total > 0 and current > 0:
-        progress_val = current / total
-        st.progress(progress_val, text=f"{msg}")
+        st.progress(min(current / total, 1.0), text=f"{msg}")
     else:
         st.progress(0, text=msg)
     
@@ -110,12 +146,11 @@ if uploaded_file:
     with col2:
         if st.button("Process", use_container_width=True, type="primary"):
             with st.spinner("Uploading..."):
-                # Upload and start processing
-                file_bytes = uploaded_file.read()
-                uploaded_file.seek(0)
-                
-                response = st.session_state.api_client.upload_file(
-                    file_bytes=file_bytes,
+                # Upload and start processing. The UploadedFile is passed
+                # straight through so httpx streams the multipart body
+                # instead of a full read() copy of the document first.
+                response = get_api_client().upload_file(
+                    fileobj=uploaded_file,
                     filename=uploaded_file.name
                 )
                 project_id = response['id']
@@ -134,10 +169,18 @@ if uploaded_file:
                 
                 # Start processing
                 try:
-                    st.session_state.api_client.process_project(project_id)
+                    get_api_client().process_project(project_id)
                 except:
                     pass
                 
+                # Drain progress events off the script thread; the
+                # monitor fragment only peeks at the latest one
+                events = deque(maxlen=1)
+                st.session_state[f'progress_q_{project_id}'] = events
+                threading.Thread(
+                    target=_drain_sse, args=(project_id, events), daemon=True
+                ).start()
+                
                 # Set monitoring
                 st.session_state.processing_project_id = project_id
                 st.session_state.monitoring = True
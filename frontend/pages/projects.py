@@ -1,64 +1,399 @@
 import streamlit as st
+import hashlib
+import html
+import io
+import json
+import re
 import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from backend.api.client import APIClient
-from openai import OpenAI
+from backend.api.client import get_default_client
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
 
-api = APIClient()
+@st.cache_resource
+def get_api_client():
+    """One pooled API client shared across all sessions.
+    
+    cache_resource keeps a single instance process-wide, so keep-alive
+    connections to the backend are reused instead of each session (or
+    module reimport) opening its own pool.
+    """
+    return get_default_client()
 
 
-def refine_with_ai(current_content: str, user_prompt: str) -> str:
-    """Use LLM to refine documentation based on user prompt."""
-    try:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        
-        client = OpenAI(api_key=api_key)
-        
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a technical documentation expert. You will receive a complete technical document and user instructions to modify it. Your task is to return the COMPLETE MODIFIED DOCUMENT with all sections intact. Never return only a portion of the document - always return the entire document from start to finish with the requested changes applied."
-                },
-                {
-                    "role": "user",
-                    "content": f"""Here is the COMPLETE technical documentation:
+@st.cache_resource
+def get_openai_client():
+    """One OpenAI client shared across all sessions.
+    
+    Reuses TLS sessions between refine calls and reads the API key from
+    the environment once instead of on every call. The openai SDK (and
+    the dotenv read) are imported here rather than at module top: the
+    common view/edit/download paths never touch them, and cache_resource
+    means even this import runs once per process, not per rerun.
+    """
+    from openai import OpenAI
+    from dotenv import load_dotenv
+    
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found in environment variables")
+    return OpenAI(api_key=api_key)
+
+
+api = get_api_client()
+
+# Compiled once; splitting per rerun with a fresh pattern re-parsed the
+# regex and rescanned the document each time the page redrew
+_MERMAID_RE = re.compile(r'(```mermaid\n.*?```)', re.DOTALL)
+
+# Optional code fence the model sometimes wraps its output in; one
+# match handles the bare and ```markdown variants plus stray newlines
+_FENCE_RE = re.compile(r'^\s*```(?:markdown)?\s*\n?(.*?)\n?```\s*$', re.DOTALL)
+
+# Section boundaries for scoped refinement: each chunk starts at an H1
+# or H2 header, so chunks can be swapped out and rejoined losslessly
+_SECTION_SPLIT_RE = re.compile(r'(?m)^(?=#{1,2} )')
+
+# Prefer a locally served mermaid bundle (see frontend/static/README.md)
+# over the CDN: each diagram iframe is an isolated browsing context, so
+# the CDN fetch can't even rely on the parent page's HTTP cache. Falls
+# back to the CDN when the asset hasn't been downloaded.
+_MERMAID_JS_SRC = (
+    "/app/static/mermaid.mjs"
+    if (Path(__file__).parent.parent / "static" / "mermaid.mjs").exists()
+    else "https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs"
+)
+
+# One HTML document hosting every diagram on the page: mermaid is
+# fetched and initialized once per render instead of once per block,
+# since each iframe is an isolated browsing context that can't share
+# the module with its siblings
+_MERMAID_PAGE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <script type="module">
+        import mermaid from '__MERMAID_JS_SRC__';
+        mermaid.initialize({
+            startOnLoad: false,
+            theme: 'default',
+            flowchart: { useMaxWidth: true, htmlLabels: true }
+        });
+        await mermaid.run();
+    </script>
+    <style>
+        html, body {
+            margin: 0;
+            padding: 0;
+            width: 100%;
+        }
+        .mermaid {
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            width: 100%;
+            height: 480px;
+            padding: 10px;
+            box-sizing: border-box;
+        }
+        .mermaid svg {
+            max-width: 100% !important;
+            max-height: 100% !important;
+            width: auto !important;
+            height: auto !important;
+        }
+    </style>
+</head>
+<body>
+__DIVS__
+</body>
+</html>
+"""
+
+
+def render_mermaid_blocks(codes):
+    """Render all mermaid diagrams for the page in one shared iframe."""
+    # The diagram source is LLM output; escape it so stray <, > or &
+    # can't break out of the div into the surrounding document (the
+    # browser unescapes text content before mermaid reads it)
+    divs = "\n".join(
+        f'<div class="mermaid">\n{html.escape(code)}\n</div>' for code in codes
+    )
+    page = _MERMAID_PAGE.replace("__MERMAID_JS_SRC__", _MERMAID_JS_SRC).replace("__DIVS__", divs)
+    st.components.v1.html(page, height=500 * len(codes))
+
+
+# Short-TTL read caches: every Edit/Preview toggle or button click
+# reruns the whole script, and without these each rerun repeated the
+# same backend GETs. Ten seconds is short enough that fresh pipeline
+# results still show up promptly.
+@st.cache_resource
+def _get_fetch_pool() -> ThreadPoolExecutor:
+    """Thread pool for overlapping the detail view's backend reads.
+    
+    cache_resource rather than module scope: Streamlit re-executes the
+    page script on every rerun, so a module-level pool would be rebuilt
+    and its threads respawned on every interaction.
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-fetch")
+
+
+@st.cache_data(ttl=10)
+def _list_projects():
+    return api.list_projects()
+
+
+# show_spinner=False on the two fetchers below: they run on pool
+# threads without a ScriptRunContext, where the default spinner can't
+# render and only logs a warning per call
+@st.cache_data(ttl=10, show_spinner=False)
+def _get_project(project_id: str):
+    return api.get_project(project_id)
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _get_techdoc(project_id: str):
+    return api.get_techdoc(project_id)
+
+
+@st.cache_data(ttl=3600, max_entries=50, show_spinner=False)
+def _get_pdf(content_hash: str, name: str, _content: str) -> bytes:
+    """Render a PDF for the given content, cached by content hash.
+    
+    _content's leading underscore keeps cache_data from hashing the
+    whole document on every lookup; content_hash stands in for it as
+    the cache key. Identical content across reruns — or across users
+    viewing the same project — hits the cache instead of re-rendering.
+    """
+    return api.generate_pdf_from_content(_content, name)
+
+
+def build_refine_messages(current_content: str, user_prompt: str) -> list:
+    """Build the chat messages for a refinement request."""
+    return [
+        {
+            "role": "system",
+            "content": "You are a technical documentation expert. You will receive a complete technical document and user instructions to modify it. Your task is to return the COMPLETE MODIFIED DOCUMENT with all sections intact. Never return only a portion of the document - always return the entire document from start to finish with the requested changes applied."
+        },
+        {
+            "role": "user",
+            "content": f"""Here is the COMPLETE technical documentation:
 
 {current_content}
 
 User's modification request: {user_prompt}
 
 IMPORTANT: Return the ENTIRE document with all sections, making only the changes requested above. Do not truncate or omit any sections. Return the complete modified document as markdown without any explanations or wrapper text."""
-                }
-            ],
-            temperature=0.7,
-        )
-        
-        refined = response.choices[0].message.content.strip()
-        
-        # Remove markdown code blocks if the LLM wrapped the output
-        if refined.startswith("```markdown"):
-            refined = refined[len("```markdown"):].strip()
-        if refined.startswith("```"):
-            refined = refined[3:].strip()
-        if refined.endswith("```"):
-            refined = refined[:-3].strip()
-        
-        return refined
-    except Exception as e:
-        st.error(f"AI refinement failed: {str(e)}")
-        return current_content
+        }
+    ]
+
+
+def refine_max_tokens(current_content: str) -> int:
+    """Output-token bound for a refinement of the given content.
+    
+    The rewrite is at most a reworded copy of the input, so bound the
+    decode phase (~4 chars per token, with 2x headroom) rather than
+    letting the model run open-ended.
+    """
+    return min(16000, max(1024, len(current_content) // 2))
+
+
+def refine_with_ai(current_content: str, user_prompt: str, model: str = "gpt-4o-mini"):
+    """Use LLM to refine documentation based on user prompt.
+    
+    Yields the refined document as text deltas so the caller can render
+    tokens the moment they arrive instead of staring at a spinner for
+    the full completion.
+    """
+    client = get_openai_client()
+    
+    stream = client.chat.completions.create(
+        model=model,
+        messages=build_refine_messages(current_content, user_prompt),
+        temperature=0.7,
+        stream=True,
+        max_tokens=refine_max_tokens(current_content),
+    )
+    
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
+def submit_refine_batch(content: str, queue: list) -> str:
+    """Submit queued refinements as one OpenAI Batch job.
+    
+    Each queued edit becomes a JSONL line scoped to the sections it
+    selected when queued. Batch jobs run at half the synchronous price
+    with separate rate limits, in exchange for minute-scale turnaround.
+    
+    Returns the batch id.
+    """
+    client = get_openai_client()
+    sections = split_markdown_sections(content)
+    
+    lines = []
+    for i, edit in enumerate(queue):
+        scope = "".join(
+            chunk for header, chunk in sections if header in edit['headers']
+        ) or content
+        lines.append(json.dumps({
+            "custom_id": f"edit-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": edit['model'],
+                "messages": build_refine_messages(scope, edit['prompt']),
+                "temperature": 0.7,
+                "max_tokens": refine_max_tokens(scope),
+            },
+        }))
+    
+    payload = "\n".join(lines).encode('utf-8')
+    batch_file = client.files.create(
+        file=("refinements.jsonl", io.BytesIO(payload)),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return batch.id
+
+
+def apply_refine_batch(content: str, queue: list, output_text: str) -> str:
+    """Splice completed batch results back into the document.
+    
+    Results are applied in queue order; each one re-splits the evolving
+    document so edits to different sections compose.
+    """
+    results = {}
+    for line in output_text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        body = (record.get('response') or {}).get('body') or {}
+        choices = body.get('choices') or []
+        if choices:
+            results[record['custom_id']] = choices[0]['message']['content']
+    
+    for i, edit in enumerate(queue):
+        refined = results.get(f"edit-{i}")
+        if not refined:
+            continue
+        refined = strip_markdown_fences(refined.strip())
+        if not refined:
+            continue
+        sections = split_markdown_sections(content)
+        selected_idx = [
+            j for j, (header, _) in enumerate(sections)
+            if header in edit['headers']
+        ]
+        if selected_idx and len(selected_idx) < len(sections):
+            content = splice_sections(sections, selected_idx, refined)
+        else:
+            content = refined
+    return content
+
+
+def split_markdown_sections(content: str):
+    """Split markdown into (header, chunk) pairs on H1/H2 headers.
+    
+    Chunks include their header line and concatenate back to the exact
+    original document. Text before the first header gets a synthetic
+    header so it is selectable too.
+    """
+    sections = []
+    for chunk in _SECTION_SPLIT_RE.split(content):
+        if not chunk:
+            continue
+        if chunk.startswith('#'):
+            header = chunk.split('\n', 1)[0].strip()
+        else:
+            header = '(introduction)'
+        sections.append((header, chunk))
+    return sections
+
+
+def splice_sections(sections, selected_idx, refined: str) -> str:
+    """Replace the selected chunks of a section list with refined text.
+    
+    When the refined text splits into exactly one chunk per selected
+    section they are swapped in place; otherwise the whole refined block
+    lands at the first selected position, since the model restructured
+    the headers and a one-to-one mapping no longer exists.
+    """
+    refined_sections = split_markdown_sections(refined)
+    selected = set(selected_idx)
+    out = []
+    
+    if len(refined_sections) == len(selected_idx):
+        replacements = dict(zip(selected_idx, (chunk for _, chunk in refined_sections)))
+        for i, (_, chunk) in enumerate(sections):
+            new_chunk = replacements.get(i, chunk)
+            if not new_chunk.endswith('\n'):
+                new_chunk += '\n\n'
+            out.append(new_chunk)
+        return "".join(out)
+    
+    inserted = False
+    for i, (_, chunk) in enumerate(sections):
+        if i in selected:
+            if not inserted:
+                out.append(refined if refined.endswith('\n') else refined + '\n\n')
+                inserted = True
+        else:
+            out.append(chunk)
+    return "".join(out)
+
+
+def strip_markdown_fences(refined: str) -> str:
+    """Remove markdown code fences if the LLM wrapped its output."""
+    m = _FENCE_RE.match(refined)
+    return m.group(1) if m else refined
+
+
+def _save_content(project_id: str, content: str) -> None:
+    """Store document content in session_state compressed.
+    
+    Markdown compresses 3-5x, and session_state is replicated per
+    connected session, so large docs are kept as a zlib blob plus a
+    16-byte blake2b fingerprint. The fingerprint stands in for the
+    content wherever change detection is needed (PDF cache keys), so
+    comparisons are O(16 bytes) instead of O(document).
+    """
+    raw = content.encode('utf-8')
+    st.session_state[f'edited_content_{project_id}'] = (
+        zlib.compress(raw, 1),
+        hashlib.blake2b(raw, digest_size=16).hexdigest(),
+    )
+
+
+def _load_content(project_id: str) -> str:
+    """Decompress and return the stored document content."""
+    blob, _ = st.session_state[f'edited_content_{project_id}']
+    return zlib.decompress(blob).decode('utf-8')
+
+
+def _content_fingerprint(project_id: str) -> str:
+    """Return the stored content's fingerprint without decompressing."""
+    return st.session_state[f'edited_content_{project_id}'][1]
+
+
+def _ensure_project_state(project_id: str, default_content: str) -> None:
+    """Initialize all per-project session keys in one pass."""
+    if f'edited_content_{project_id}' not in st.session_state:
+        _save_content(project_id, default_content)
 
 
 def render_project_card(project):
@@ -89,6 +424,7 @@ def render_project_card(project):
         with col4:
             if st.button("Delete", key=f"delete_{project['id']}", use_container_width=True, help="Delete project"):
                 if api.delete_project(project['id']):
+                    _list_projects.clear()
                     st.rerun()
                 else:
                     st.error("Failed to delete")
@@ -96,45 +432,43 @@ def render_project_card(project):
 
 def render_project_details(project_id: str):
     """Result display with review and edit capabilities"""
+    ss = st.session_state
     try:
-        project = api.get_project(project_id)
-        srs = api.get_requirements(project_id)
-        tech_doc = api.get_techdoc(project_id)
+        # Overlap the two backend reads: wall-clock becomes the max of
+        # the two latencies rather than their sum
+        fetch_pool = _get_fetch_pool()
+        project_future = fetch_pool.submit(_get_project, project_id)
+        techdoc_future = fetch_pool.submit(_get_techdoc, project_id)
+        project = project_future.result()
+        tech_doc = techdoc_future.result()
         md_content = tech_doc.get("content", "") if isinstance(tech_doc, dict) else tech_doc
         
-        # Initialize edit mode state
-        if f'edit_mode_{project_id}' not in st.session_state:
-            st.session_state[f'edit_mode_{project_id}'] = False
-        if f'edited_content_{project_id}' not in st.session_state:
-            st.session_state[f'edited_content_{project_id}'] = md_content
+        _ensure_project_state(project_id, md_content)
+        # One decompression per rerun; every reader below shares this
+        current_content = _load_content(project_id)
         
         # Back button
         if st.button("← Back to Projects"):
-            if "selected_project_id" in st.session_state:
-                del st.session_state.selected_project_id
+            if "selected_project_id" in ss:
+                del ss.selected_project_id
             st.rerun()
         
         st.title(project['name'])
         
-        # Action buttons
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            if st.session_state[f'edit_mode_{project_id}']:
-                if st.button("Preview", use_container_width=True):
-                    st.session_state[f'edit_mode_{project_id}'] = False
-                    st.rerun()
-            else:
-                if st.button("Edit", use_container_width=True):
-                    st.session_state[f'edit_mode_{project_id}'] = True
-                    st.rerun()
-        
-        with col2:
-            if st.button("AI Refine", use_container_width=True):
-                st.session_state[f'show_ai_prompt_{project_id}'] = True
-                st.rerun()
+        # One radio drives the page mode: the old Edit/Preview and AI
+        # Refine buttons each flipped a session flag and forced a rerun,
+        # three widgets plus two booleans to keep in sync. Mode is now
+        # pure widget state and switching it re-renders from cached data.
+        mode = st.radio(
+            "Mode",
+            ["Preview", "Edit", "AI Refine"],
+            horizontal=True,
+            label_visibility="collapsed",
+            key=f"mode_{project_id}"
+        )
         
-        with col3:
-            current_content = st.session_state[f'edited_content_{project_id}']
+        col1, col2 = st.columns(2)
+        with col1:
             st.download_button(
                 "Download MD",
                 data=current_content,
@@ -143,36 +477,27 @@ def render_project_details(project_id: str):
                 use_container_width=True
             )
         
-        with col4:
+        with col2:
             # Auto-generate and download PDF
-            current_content = st.session_state[f'edited_content_{project_id}']
-            
-            # Generate PDF on first load or if content changed
-            if f'pdf_bytes_{project_id}' not in st.session_state or \
-               f'last_content_{project_id}' not in st.session_state or \
-               st.session_state[f'last_content_{project_id}'] != current_content:
-                try:
-                    with st.spinner("Generating PDF..."):
-                        pdf_bytes = api.generate_pdf_from_content(current_content, f"{project['name']}_techdoc")
-                        st.session_state[f'pdf_bytes_{project_id}'] = pdf_bytes
-                        st.session_state[f'last_content_{project_id}'] = current_content
-                except Exception as e:
-                    st.error(f"PDF generation failed: {str(e)}")
-            
-            # Show download button
-            if f'pdf_bytes_{project_id}' in st.session_state:
+            try:
+                with st.spinner("Generating PDF..."):
+                    content_hash = _content_fingerprint(project_id)
+                    pdf_bytes = _get_pdf(content_hash, f"{project['name']}_techdoc", current_content)
+                
                 st.download_button(
                     "Download PDF",
-                    data=st.session_state[f'pdf_bytes_{project_id}'],
+                    data=pdf_bytes,
                     file_name=f"{project['name']}_techdoc.pdf",
                     mime="application/pdf",
                     use_container_width=True
                 )
+            except Exception as e:
+                st.error(f"PDF generation failed: {str(e)}")
         
         st.divider()
         
         # AI Refine prompt area
-        if st.session_state.get(f'show_ai_prompt_{project_id}', False):
+        if mode == "AI Refine":
             with st.container(border=True):
                 st.markdown("### AI Refinement")
                 ai_prompt = st.text_area(
@@ -181,104 +506,168 @@ def render_project_details(project_id: str):
                     height=100
                 )
                 
+                model = st.selectbox(
+                    "Model",
+                    ["gpt-4o-mini", "gpt-4o"],
+                    help="gpt-4o-mini is faster and cheaper, and usually enough for rewrites; pick gpt-4o for heavier restructuring"
+                )
+                
+                # Scoped refinement: only the selected sections are sent
+                # to (and regenerated by) the model, so a one-section
+                # tweak doesn't pay for a full-document rewrite
+                sections = split_markdown_sections(current_content)
+                section_headers = [header for header, _ in sections]
+                selected_headers = st.multiselect(
+                    "Sections to refine",
+                    section_headers,
+                    default=section_headers,
+                    help="Fewer sections means a faster, cheaper refinement"
+                )
+                
                 col1, col2 = st.columns([1, 4])
                 with col1:
                     if st.button("Apply Changes", type="primary"):
-                        if ai_prompt:
-                            with st.spinner("AI is refining the documentation..."):
-                                # Call LLM to refine content
-                                refined_content = refine_with_ai(
-                                    st.session_state[f'edited_content_{project_id}'],
-                                    ai_prompt
-                                )
-                                st.session_state[f'edited_content_{project_id}'] = refined_content
-                                st.session_state[f'show_ai_prompt_{project_id}'] = False
+                        if ai_prompt and selected_headers:
+                            selected_idx = [
+                                i for i, (header, _) in enumerate(sections)
+                                if header in selected_headers
+                            ]
+                            partial = len(selected_idx) < len(sections)
+                            if partial:
+                                scope = "".join(sections[i][1] for i in selected_idx)
+                            else:
+                                scope = current_content
+                            
+                            # Stream tokens into a placeholder as they
+                            # arrive; the first words show up in well
+                            # under a second instead of after the full
+                            # completion
+                            placeholder = st.empty()
+                            buf = []
+                            last_paint = 0.0
+                            try:
+                                for delta in refine_with_ai(scope, ai_prompt, model=model):
+                                    buf.append(delta)
+                                    # Repaint on a time budget, not per
+                                    # delta: re-joining and re-rendering
+                                    # the full document every token is
+                                    # O(n^2) and a websocket push each
+                                    # time, which on long outputs costs
+                                    # more than the blocking call did
+                                    now = time.monotonic()
+                                    if now - last_paint >= 0.15:
+                                        placeholder.markdown("".join(buf))
+                                        last_paint = now
+                                
+                                placeholder.markdown("".join(buf))
+                                refined_content = strip_markdown_fences("".join(buf).strip())
+                                if refined_content and partial:
+                                    refined_content = splice_sections(sections, selected_idx, refined_content)
+                                if refined_content:
+                                    _save_content(project_id, refined_content)
                                 st.success("Changes applied!")
                                 st.rerun()
+                            except Exception as e:
+                                st.error(f"AI refinement failed: {str(e)}")
                         else:
-                            st.error("Please enter your instructions")
+                            st.error("Please enter your instructions and pick at least one section")
                 
                 with col2:
-                    if st.button("Cancel"):
-                        st.session_state[f'show_ai_prompt_{project_id}'] = False
-                        st.rerun()
+                    if st.button("Queue edit", help="Collect several edits and run them together at half the synchronous price"):
+                        if ai_prompt and selected_headers:
+                            ss.setdefault(f'edit_queue_{project_id}', []).append({
+                                'prompt': ai_prompt,
+                                'model': model,
+                                'headers': selected_headers,
+                            })
+                            st.rerun()
+                        else:
+                            st.error("Please enter your instructions and pick at least one section")
+                
+                
+                # Queued edits run through the Batch API: 50% of the
+                # synchronous price and separate rate limits, in
+                # exchange for minute-scale turnaround
+                queue = ss.get(f'edit_queue_{project_id}', [])
+                batch_id = ss.get(f'batch_id_{project_id}')
+                
+                if queue and not batch_id:
+                    st.caption(f"{len(queue)} edit(s) queued: " + "; ".join(
+                        edit['prompt'][:60] for edit in queue
+                    ))
+                    if st.button("Run batch", type="primary"):
+                        try:
+                            ss[f'batch_id_{project_id}'] = submit_refine_batch(
+                                current_content,
+                                queue
+                            )
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Batch submission failed: {str(e)}")
+                
+                if batch_id:
+                    st.caption(f"Batch {batch_id} submitted with {len(queue)} edit(s)")
+                    if st.button("Check results"):
+                        try:
+                            client = get_openai_client()
+                            batch = client.batches.retrieve(batch_id)
+                            if batch.status == 'completed':
+                                output_text = client.files.content(batch.output_file_id).text
+                                _save_content(project_id, apply_refine_batch(
+                                    current_content,
+                                    queue,
+                                    output_text
+                                ))
+                                del ss[f'batch_id_{project_id}']
+                                del ss[f'edit_queue_{project_id}']
+                                st.success("Batch results applied!")
+                                st.rerun()
+                            elif batch.status in ('failed', 'expired', 'cancelled'):
+                                st.error(f"Batch {batch.status}")
+                                del ss[f'batch_id_{project_id}']
+                            else:
+                                st.info(f"Batch status: {batch.status} — check again in a bit")
+                        except Exception as e:
+                            st.error(f"Batch check failed: {str(e)}")
             
             st.divider()
         
         # Edit mode or preview
-        if st.session_state[f'edit_mode_{project_id}']:
+        if mode == "Edit":
             st.markdown("### Edit Documentation")
             edited = st.text_area(
                 "Edit the content below:",
-                value=st.session_state[f'edited_content_{project_id}'],
+                value=current_content,
                 height=600,
                 key=f"editor_{project_id}"
             )
             
-            if edited != st.session_state[f'edited_content_{project_id}']:
-                st.session_state[f'edited_content_{project_id}'] = edited
+            if edited != current_content:
+                _save_content(project_id, edited)
                 st.success("Changes saved locally")
         else:
             st.divider()
         
-        import re
-        
         # Use edited content if available
-        display_content = st.session_state[f'edited_content_{project_id}']
+        display_content = current_content
         
         # Split content by mermaid blocks
-        parts = re.split(r'(```mermaid\n.*?```)', display_content, flags=re.DOTALL)
+        parts = _MERMAID_RE.split(display_content)
+        
+        # All diagrams share one iframe (emitted at the first block's
+        # position) so mermaid's ESM module is fetched and parsed once
+        # instead of once per diagram
+        mermaid_codes = [
+            part.replace('```mermaid\n', '').replace('```', '').strip()
+            for part in parts if part.startswith('```mermaid')
+        ]
+        diagrams_rendered = False
         
-        for i, part in enumerate(parts):
+        for part in parts:
             if part.startswith('```mermaid'):
-                # Extract mermaid code
-                mermaid_code = part.replace('```mermaid\n', '').replace('```', '').strip()
-                # Render using HTML with mermaid.js with proper scaling
-                html_code = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <script type="module">
-                        import mermaid from 'https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs';
-                        mermaid.initialize({{ 
-                            startOnLoad: true, 
-                            theme: 'default',
-                            flowchart: {{ useMaxWidth: true, htmlLabels: true }}
-                        }});
-                    </script>
-                    <style>
-                        html, body {{ 
-                            margin: 0; 
-                            padding: 0; 
-                            overflow: hidden;
-                            width: 100%;
-                            height: 100%;
-                        }}
-                        .mermaid {{ 
-                            display: flex; 
-                            justify-content: center;
-                            align-items: center;
-                            width: 100%;
-                            height: 100%;
-                            padding: 10px;
-                            box-sizing: border-box;
-                        }}
-                        .mermaid svg {{
-                            max-width: 100% !important;
-                            max-height: 100% !important;
-                            width: auto !important;
-                            height: auto !important;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div class="mermaid">
-                    {mermaid_code}
-                    </div>
-                </body>
-                </html>
-                """
-                st.components.v1.html(html_code, height=500)
+                if not diagrams_rendered:
+                    render_mermaid_blocks(mermaid_codes)
+                    diagrams_rendered = True
             else:
                 # Regular markdown
                 if part.strip():
@@ -287,8 +676,8 @@ def render_project_details(project_id: str):
     except Exception as e:
         st.error(f"Error: {str(e)}")
         if st.button("← Back"):
-            if "selected_project_id" in st.session_state:
-                del st.session_state.selected_project_id
+            if "selected_project_id" in ss:
+                del ss.selected_project_id
             st.rerun()
 
 
@@ -300,7 +689,7 @@ else:
     st.title("Project History")
     
     try:
-        projects = api.list_projects()
+        projects = _list_projects()
         
         if not projects:
             st.info("🎯 No projects yet. Upload a document to get started!")
@@ -6,6 +6,51 @@ from typing import Optional, Dict, Any
 logger = logging.getLogger(__name__)
 
 
+def iter_progress_events(project_id: str, base_url: str = "http://localhost:8000", connect_timeout: float = 5.0):
+    """
+    Yield parsed progress events from the SSE stream as they arrive.
+    
+    Blocks between events — the server pushes each update the moment it
+    happens, so there is no polling interval to wait out. Heartbeat
+    events are filtered; the caller decides when to stop iterating
+    (typically on a terminal completed/error event).
+    
+    Args:
+        project_id: Project ID to stream progress for
+        base_url: Backend URL
+        connect_timeout: Timeout in seconds for the initial connection
+        
+    Yields:
+        Progress data dicts
+    """
+    url = f"{base_url}/projects/{project_id}/progress-stream"
+    
+    # Long read timeout: the server sends heartbeats every 15s, so a
+    # much longer gap means the stream is actually dead
+    response = requests.get(url, stream=True, timeout=(connect_timeout, 60))
+    response.raise_for_status()
+    
+    try:
+        event_type = None
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            
+            if line.startswith('event:'):
+                event_type = line[6:].strip()
+            elif line.startswith('data:'):
+                data_str = line[5:].strip()
+                try:
+                    data = json.loads(data_str)
+                except json.JSONDecodeError:
+                    continue
+                if event_type == 'heartbeat':
+                    continue
+                yield data
+    finally:
+        response.close()
+
+
 def get_progress_stream(project_id: str, base_url: str = "http://localhost:8000", timeout: int = 5) -> Optional[Dict[str, Any]]:
     """
     Get one progress update from SSE stream (non-blocking).